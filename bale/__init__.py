@@ -9,12 +9,13 @@
 # You should have received a copy of the GNU General Public License v2.0
 # along with this program. If not, see <https://www.gnu.org/licenses/gpl-2.0.html>.
 
-from .bot import Bot
+from ._baleobject import BaleObject
 from .update import Update
 from .message import Message
 from .callbackquery import CallbackQuery
 from .user import User
 from .chat import Chat
+from .bot import Bot
 from .inlinekeyboardmarkup import InlineKeyboardMarkup
 from .inlinekeyboardbutton import InlineKeyboardButton
 from .menukeyboardmarkup import MenuKeyboardMarkup
@@ -0,0 +1,63 @@
+# An API wrapper for Bale written in Python
+# Copyright (c) 2022-2024
+# Kian Ahmadian <devs@python-bale-bot.ir>
+# All rights reserved.
+
+from typing import Any, Dict, Optional
+
+__all__ = ("BaleObject",)
+
+
+class BaleObject:
+    """Base class for the attachment and payment objects
+
+    Subclasses call :meth:`_lock` at the end of ``__init__``; after that their
+    attributes can't be reassigned.
+    """
+    
+    __slots__ = (
+        "_id",
+        "_bot",
+        "_frozen"
+    )
+    
+    def __init__(self) -> None:
+        self._frozen = False
+        self._id = None
+        self._bot = None
+    
+    def __setattr__(self, key: str, value: Any) -> None:
+        if getattr(self, "_frozen", False) and key not in BaleObject.__slots__:
+            raise AttributeError(f"can't set attribute {key!r} of {type(self).__name__}")
+        super().__setattr__(key, value)
+    
+    def _lock(self) -> None:
+        self._frozen = True
+    
+    def _unlock(self) -> None:
+        self._frozen = False
+    
+    def get_bot(self):
+        """The bot this object was received through"""
+        bot = getattr(self, "_bot", None)
+        if bot is None:
+            raise RuntimeError(f"{type(self).__name__} is not bound to a bot")
+        return bot
+    
+    def set_bot(self, bot) -> None:
+        self._bot = bot
+    
+    @staticmethod
+    def parse_data(data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Shallow copy of an API payload, so parsing can pop keys from it"""
+        return None if data is None else dict(data)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, type(self)) and self._id is not None:
+            return self._id == other._id
+        return super().__eq__(other)
+    
+    def __hash__(self) -> int:
+        if self._id is not None:
+            return hash((type(self), self._id))
+        return super().__hash__()
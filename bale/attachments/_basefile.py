@@ -13,8 +13,6 @@ from bale import BaleObject
 from typing import Optional, Any, ClassVar, Union
 from io import BufferedIOBase
 
-from ._inputfile import InputFile
-
 __all__ = ("BaseFile",)
 
 
@@ -94,7 +92,7 @@ class BaseFile(BaleObject):
 
         return data
 
-    def to_input_file(self) -> InputFile:
+    def to_input_file(self) -> "InputFile":
         """Converts the file to a standard object for sending/uploading it.
         This object is require in the file sending methods.
 
@@ -103,6 +101,7 @@ class BaseFile(BaleObject):
             :class:`bale.InputFile`
                 The :class:`bale.InputFile` Object for send.
         """
+        from ._inputfile import InputFile
         return InputFile(self.file_id)
 
     def __len__(self):
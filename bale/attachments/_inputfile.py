@@ -3,19 +3,26 @@
 # Kian Ahmadian <devs@python-bale-bot.ir>
 # All rights reserved.
 
+import os
 from typing import Union, BinaryIO
 from ._basefile import BaseFile
 
 class InputFile(BaseFile):
-    """Input file for uploads"""
+    """Input file for uploads
+
+    ``file`` may be a path or an open binary file. Paths are only opened when
+    the upload is built, and the handle is streamed by aiohttp in chunks.
+    """
     
     def __init__(self, file: Union[str, BinaryIO], filename: str = None):
         self.file = file
-        self.filename = filename or getattr(file, 'name', 'file')
+        self.filename = filename or os.path.basename(file if isinstance(file, str) else getattr(file, 'name', 'file'))
     
     def to_multipart_payload(self) -> dict:
         """Convert to multipart payload"""
+        value = open(self.file, 'rb') if isinstance(self.file, str) else self.file
         return {
-            'value': self.file,
-            'filename': self.filename
+            'value': value,
+            'filename': self.filename,
+            'content_type': 'application/octet-stream'
         }
\ No newline at end of file
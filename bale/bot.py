@@ -4,34 +4,112 @@
 # All rights reserved.
 
 import asyncio
+import hashlib
+import heapq
+import inspect
+import json
 import logging
-from typing import Any, Dict, List, Optional, Callable, Union
+import os
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Callable, Set, Tuple, Union
 from .request.http import HTTPClient
+from .utils.request import RequestParams
 from .handlers import BaseHandler
 from .update import Update
 from .message import Message
 from .callbackquery import CallbackQuery
+from .inlinekeyboardmarkup import InlineKeyboardMarkup
+from .menukeyboardmarkup import MenuKeyboardMarkup
 
 logger = logging.getLogger(__name__)
 
+POLLING_TIMEOUT = 30
+MAX_RETRY_DELAY = 30
+MAX_CONCURRENT_UPDATES = 128
+CHAT_MEMBER_CACHE_SIZE = 5000
+CHAT_MEMBER_CACHE_TTL = 3600
+BOT_INFO_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bale")
+BOT_INFO_CACHE_TTL = 24 * 3600
+
+def _serialize_markup(markup: Any) -> Any:
+    """Convert keyboard markup objects to dicts, passing raw dicts through"""
+    if isinstance(markup, (InlineKeyboardMarkup, MenuKeyboardMarkup)):
+        return markup.to_dict()
+    return markup
+
 class Bot:
     """Main Bot class for Bale API"""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, max_concurrent_updates: int = MAX_CONCURRENT_UPDATES,
+                 cache_dir: Optional[str] = BOT_INFO_CACHE_DIR, **http_options):
         self.token = token
-        self.http = HTTPClient(token)
+        # extra keyword arguments configure the HTTP client's connection pool
+        self.http = HTTPClient(token, **http_options)
         self.handlers: List[BaseHandler] = []
         self.running = False
         self.user: Optional[Dict] = None
+        self.max_concurrent_updates = max_concurrent_updates
+        self._update_semaphore: Optional[asyncio.Semaphore] = None
+        self._pending_updates: Set[asyncio.Task] = set()
+        # Indexes over ``handlers`` as (registration position, handler), in registration order
+        self._command_handlers: Dict[str, List[Tuple[int, BaseHandler]]] = {}
+        self._fallback_handlers: List[Tuple[int, BaseHandler]] = []
+        self._chat_member_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.cache_dir = cache_dir
+        self._refresh_user_task: Optional[asyncio.Task] = None
         
     async def get_me(self) -> Dict[str, Any]:
         """Get bot information"""
-        return await self.http.get_me()
+        response = await self.http.get_me()
+        return response.result
+    
+    def _bot_info_cache_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        key = hashlib.blake2b(self.token.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _load_cached_user(self) -> Optional[Dict[str, Any]]:
+        """Load the bot info saved by a previous run, if it is still fresh"""
+        path = self._bot_info_cache_path()
+        try:
+            if not path or time.time() - os.path.getmtime(path) > BOT_INFO_CACHE_TTL:
+                return None
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+    
+    async def _refresh_user(self) -> Dict[str, Any]:
+        """Fetch the bot info from the API and save it for the next start"""
+        self.user = await self.get_me()
+        path = self._bot_info_cache_path()
+        if path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(self.user, file)
+            except (OSError, TypeError) as e:
+                logger.debug("Could not cache bot info: %s", e)
+        return self.user
+    
+    async def _refresh_user_in_background(self):
+        try:
+            await self._refresh_user()
+        except Exception:
+            logger.exception("Error refreshing bot info")
     
     async def send_message(self, chat_id: Union[str, int], text: str, 
                           reply_markup: Optional[Any] = None,
-                          parse_mode: str = "Markdown") -> Message:
-        """Send a text message"""
+                          parse_mode: str = "Markdown",
+                          wait_response: bool = True) -> Optional[Message]:
+        """Send a text message
+
+        With ``wait_response=False`` the reply body is not decoded and ``None``
+        is returned, for callers that don't use the sent message.
+        """
         data = {
             "chat_id": chat_id,
             "text": text,
@@ -39,10 +117,39 @@ class Bot:
         }
         
         if reply_markup:
-            data["reply_markup"] = reply_markup.to_dict() if hasattr(reply_markup, 'to_dict') else reply_markup
+            data["reply_markup"] = _serialize_markup(reply_markup)
             
-        response = await self.http.send_message(data)
-        return Message.from_dict(response["result"])
+        params = RequestParams(**data)
+        if not wait_response:
+            await self.http.send_message(params=params, parse_response=False)
+            return None
+        
+        response = await self.http.send_message(params=params)
+        return Message.from_dict(response.result)
+    
+    async def broadcast(self, chat_ids: Iterable[Union[str, int]], text: str,
+                        reply_markup: Optional[Any] = None,
+                        parse_mode: str = "Markdown",
+                        concurrency: int = 50) -> List[Union[Message, Exception]]:
+        """Send the same text message to many chats concurrently
+
+        At most ``concurrency`` requests are in flight at once. The result list
+        follows the order of ``chat_ids``; failed sends hold their exception
+        instead of raising.
+        """
+        if reply_markup is not None:
+            reply_markup = _serialize_markup(reply_markup)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def send_one(chat_id):
+            async with semaphore:
+                try:
+                    return await self.send_message(chat_id, text, reply_markup=reply_markup,
+                                                   parse_mode=parse_mode)
+                except Exception as e:
+                    return e
+        
+        return await asyncio.gather(*(send_one(chat_id) for chat_id in chat_ids))
     
     async def send_photo(self, chat_id: Union[str, int], photo: Any, 
                         caption: str = "", reply_markup: Optional[Any] = None) -> Message:
@@ -54,10 +161,10 @@ class Bot:
         }
         
         if reply_markup:
-            data["reply_markup"] = reply_markup.to_dict() if hasattr(reply_markup, 'to_dict') else reply_markup
+            data["reply_markup"] = _serialize_markup(reply_markup)
             
-        response = await self.http.send_photo(data)
-        return Message.from_dict(response["result"])
+        response = await self.http.send_photo(params=RequestParams(**data))
+        return Message.from_dict(response.result)
     
     async def send_document(self, chat_id: Union[str, int], document: Any, 
                            caption: str = "") -> Message:
@@ -68,8 +175,8 @@ class Bot:
             "caption": caption
         }
         
-        response = await self.http.send_document(data)
-        return Message.from_dict(response["result"])
+        response = await self.http.send_document(params=RequestParams(**data))
+        return Message.from_dict(response.result)
     
     async def edit_message_text(self, chat_id: Union[str, int], message_id: int, 
                                text: str, reply_markup: Optional[Any] = None) -> Message:
@@ -81,10 +188,10 @@ class Bot:
         }
         
         if reply_markup:
-            data["reply_markup"] = reply_markup.to_dict() if hasattr(reply_markup, 'to_dict') else reply_markup
+            data["reply_markup"] = _serialize_markup(reply_markup)
             
-        response = await self.http.edit_message_text(data)
-        return Message.from_dict(response["result"])
+        response = await self.http.edit_message_text(params=RequestParams(**data))
+        return Message.from_dict(response.result)
     
     async def answer_callback_query(self, callback_query_id: str, text: str = "", 
                                    show_alert: bool = False) -> bool:
@@ -95,22 +202,53 @@ class Bot:
             "show_alert": show_alert
         }
         
-        response = await self.http.answer_callback_query(data)
-        return response.get("ok", False)
+        return await self.http.answer_callback_query(params=RequestParams(**data))
     
     async def get_chat_member(self, chat_id: Union[str, int], user_id: Union[str, int]) -> Dict[str, Any]:
-        """Get chat member information"""
+        """Get chat member information
+
+        Results are cached per ``(chat_id, user_id)`` for ``CHAT_MEMBER_CACHE_TTL``
+        seconds; call :meth:`invalidate_chat_member` after changing a member's role.
+        """
+        key = (str(chat_id), str(user_id))
+        cached = self._chat_member_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._chat_member_cache.move_to_end(key)
+            return cached[1]
+        
         data = {
             "chat_id": chat_id,
             "user_id": user_id
         }
         
-        response = await self.http.get_chat_member(data)
-        return response["result"]
+        response = await self.http.get_chat_member(params=RequestParams(**data))
+        member = response.result
+        
+        self._chat_member_cache[key] = (time.monotonic() + CHAT_MEMBER_CACHE_TTL, member)
+        self._chat_member_cache.move_to_end(key)
+        if len(self._chat_member_cache) > CHAT_MEMBER_CACHE_SIZE:
+            self._chat_member_cache.popitem(last=False)
+        return member
+    
+    def invalidate_chat_member(self, chat_id: Union[str, int], user_id: Union[str, int]):
+        """Drop the cached chat member entry for a user"""
+        self._chat_member_cache.pop((str(chat_id), str(user_id)), None)
     
     def handle(self, handler: BaseHandler):
-        """Add a handler to the bot"""
+        """Add a handler to the bot
+
+        Handlers that declare ``commands`` (e.g. :class:`CommandHandler`) are
+        indexed by command name so dispatch doesn't have to try them one by one.
+        Handlers are still tried in the order they were added.
+        """
+        entry = (len(self.handlers), handler)
         self.handlers.append(handler)
+        commands = getattr(handler, "commands", None)
+        if commands:
+            for command in commands:
+                self._command_handlers.setdefault(command, []).append(entry)
+        else:
+            self._fallback_handlers.append(entry)
         return handler
     
     def listen(self, event: str):
@@ -126,51 +264,111 @@ class Bot:
         try:
             update = Update.from_dict(update_data)
             
-            for handler in self.handlers:
-                if await handler.check(update):
-                    await handler.handle(update)
+            candidates = self._fallback_handlers
+            message = update.message
+            if message and message.text and message.text.startswith('/'):
+                command = message.text[1:].split(maxsplit=1)
+                if command and command[0] in self._command_handlers:
+                    # interleave by registration position so earlier handlers still win
+                    candidates = heapq.merge(self._command_handlers[command[0]], candidates,
+                                             key=itemgetter(0))
+            
+            for _, handler in candidates:
+                args = handler.check_new_update(update)
+                if inspect.isawaitable(args):
+                    args = await args
+                if args:
+                    await handler.handle_update(update, *args)
                     break
                     
         except Exception as e:
-            logger.error(f"Error processing update: {e}")
+            logger.error("Error processing update: %s", e)
+    
+    async def _dispatch_update(self, update_data: Dict[str, Any], update_handler: Optional[Callable] = None):
+        """Run one update through its handler, bounded by the update semaphore"""
+        async with self._update_semaphore:
+            if update_handler:
+                await update_handler(update_data)
+            else:
+                await self.process_update(update_data)
+    
+    def _schedule_update(self, update_data: Dict[str, Any], update_handler: Optional[Callable] = None):
+        """Process an update in the background so polling isn't blocked by slow handlers"""
+        task = asyncio.create_task(self._dispatch_update(update_data, update_handler))
+        self._pending_updates.add(task)
+        task.add_done_callback(self._pending_updates.discard)
     
     async def start_polling(self, update_handler: Optional[Callable] = None, 
-                           allowed_updates: Optional[List[str]] = None):
-        """Start polling for updates"""
+                           allowed_updates: Optional[List[str]] = None,
+                           timeout: int = POLLING_TIMEOUT):
+        """Start polling for updates
+
+        ``timeout`` is forwarded to ``getUpdates`` so the server holds the
+        request open until an update arrives (long polling).
+        """
         logger.info("Starting bot polling...")
         self.running = True
         
-        # Get bot info
-        self.user = await self.get_me()
-        logger.info(f"Bot started: {self.user.get('first_name', 'Unknown')}")
+        if self.http.is_closed():
+            await self.http.start()
+        if self._update_semaphore is None:
+            self._update_semaphore = asyncio.Semaphore(self.max_concurrent_updates)
+        
+        # Get bot info, from the on-disk cache when possible
+        self.user = self._load_cached_user()
+        if self.user is None:
+            await self._refresh_user()
+        else:
+            self._refresh_user_task = asyncio.create_task(self._refresh_user_in_background())
+        logger.info("Bot started: %s", self.user.get('first_name', 'Unknown'))
         
         # Start polling loop
         offset = 0
+        retry_delay = 1
         while self.running:
             try:
-                updates = await self.http.get_updates(offset=offset, allowed_updates=allowed_updates)
+                params = {"offset": offset, "timeout": timeout}
+                if allowed_updates is not None:
+                    params["allowed_updates"] = allowed_updates
+                response = await self.http.get_updates(params=RequestParams(**params))
                 
-                for update_data in updates:
-                    if update_handler:
-                        await update_handler(update_data)
-                    else:
-                        await self.process_update(update_data)
-                    
+                for update_data in response.result or ():
                     offset = update_data["update_id"] + 1
+                    self._schedule_update(update_data, update_handler)
                 
-                await asyncio.sleep(1)  # Polling interval
+                retry_delay = 1
                 
-            except Exception as e:
-                logger.error(f"Error in polling loop: {e}")
-                await asyncio.sleep(5)  # Wait before retrying
+            except Exception:
+                logger.exception("Error in polling loop")
+                await asyncio.sleep(retry_delay)  # Back off before retrying
+                retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
     
     async def stop_polling(self):
         """Stop polling"""
         logger.info("Stopping bot polling...")
         self.running = False
+        if self._pending_updates:
+            await asyncio.gather(*self._pending_updates, return_exceptions=True)
+        # the background bot info refresh still uses the session, so end it first
+        task, self._refresh_user_task = self._refresh_user_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.http.close()
     
-    def run(self):
-        """Run the bot (blocking)"""
+    def run(self, use_uvloop: bool = True):
+        """Run the bot (blocking)
+
+        When ``use_uvloop`` is set and uvloop is installed, the bot runs on
+        uvloop's event loop instead of the default asyncio loop.
+        """
+        if use_uvloop:
+            try:
+                import uvloop
+            except ImportError:
+                pass
+            else:
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
         asyncio.run(self._run())
     
     async def _run(self):
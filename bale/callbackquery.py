@@ -10,6 +10,13 @@ from .message import Message
 class CallbackQuery:
     """Callback query object"""
     
+    __slots__ = (
+        "id",
+        "from_user",
+        "message",
+        "data"
+    )
+    
     def __init__(self, id: str, from_user: Optional[User] = None, 
                  message: Optional[Message] = None, data: Optional[str] = None):
         self.id = id
@@ -8,6 +8,16 @@ from typing import Any, Dict, Optional
 class Chat:
     """Chat object"""
     
+    __slots__ = (
+        "id",
+        "type",
+        "title",
+        "username",
+        "first_name",
+        "last_name"
+    )
+    _OPTIONAL_FIELDS = ("title", "username", "first_name", "last_name")
+    
     def __init__(self, id: int, type: str, title: Optional[str] = None,
                  username: Optional[str] = None, first_name: Optional[str] = None,
                  last_name: Optional[str] = None):
@@ -36,17 +46,5 @@ class Chat:
             "id": self.id,
             "type": self.type
         }
-        
-        if self.title:
-            result["title"] = self.title
-        
-        if self.username:
-            result["username"] = self.username
-        
-        if self.first_name:
-            result["first_name"] = self.first_name
-        
-        if self.last_name:
-            result["last_name"] = self.last_name
-        
+        result.update({field: value for field in self._OPTIONAL_FIELDS if (value := getattr(self, field))})
         return result
\ No newline at end of file
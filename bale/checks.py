@@ -140,8 +140,8 @@ class MessageCheck(BaseCheck):
         return self
 
     async def check_update(self, update: "Update") -> bool:
-        if self.for_what and (result := self.for_what(update)):
         target_message: Optional["Message"] = None
+        if self.for_what and (result := self.for_what(update)):
             if isinstance(result, Message):
                 target_message = self.for_what(update)
         else:
@@ -111,6 +111,10 @@ class BaseHandler:
     async def check_new_update(self, update: "Update") -> Optional[Tuple]:
         """This function determines whether the "update" should be covered by the handler or not.
 
+        .. hint::
+            Subclasses whose check needs no I/O may override it with a regular (non-async) method;
+            the bot only awaits the result when it is awaitable.
+
         Parameters
         ----------
             update: :class:`bale.Update`
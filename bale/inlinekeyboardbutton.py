@@ -14,9 +14,13 @@ class InlineKeyboardButton:
         self.callback_data = callback_data
         self.url = url
         self.other_data = kwargs
+        self._cached_dict: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
+        if self._cached_dict is not None:
+            return self._cached_dict
+        
         result = {"text": self.text}
         
         if self.callback_data:
@@ -26,4 +30,10 @@ class InlineKeyboardButton:
             result["url"] = self.url
         
         result.update(self.other_data)
-        return result
\ No newline at end of file
+        self._cached_dict = result
+        return result
+    
+    def rebuild(self) -> "InlineKeyboardButton":
+        """Drop the cached payload so the next :meth:`to_dict` recomputes it"""
+        self._cached_dict = None
+        return self
\ No newline at end of file
@@ -3,20 +3,35 @@
 # Kian Ahmadian <devs@python-bale-bot.ir>
 # All rights reserved.
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .inlinekeyboardbutton import InlineKeyboardButton
 
 class InlineKeyboardMarkup:
-    """Inline keyboard markup"""
+    """Inline keyboard markup
+
+    The keyboard is treated as immutable once serialized: :meth:`to_dict`
+    caches its result, so call :meth:`rebuild` after changing the buttons.
+    """
     
     def __init__(self, inline_keyboard: List[List[InlineKeyboardButton]]):
         self.inline_keyboard = inline_keyboard
+        self._cached_dict: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "inline_keyboard": [
-                [button.to_dict() for button in row] 
-                for row in self.inline_keyboard
-            ]
-        }
\ No newline at end of file
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "inline_keyboard": [
+                    [button.to_dict() for button in row] 
+                    for row in self.inline_keyboard
+                ]
+            }
+        return self._cached_dict
+    
+    def rebuild(self) -> "InlineKeyboardMarkup":
+        """Drop the cached payload of the keyboard and its buttons"""
+        self._cached_dict = None
+        for row in self.inline_keyboard:
+            for button in row:
+                button.rebuild()
+        return self
\ No newline at end of file
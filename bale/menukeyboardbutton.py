@@ -11,9 +11,17 @@ class MenuKeyboardButton:
     def __init__(self, text: str, **kwargs):
         self.text = text
         self.other_data = kwargs
+        self._cached_dict: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        result = {"text": self.text}
-        result.update(self.other_data)
-        return result
\ No newline at end of file
+        if self._cached_dict is None:
+            result = {"text": self.text}
+            result.update(self.other_data)
+            self._cached_dict = result
+        return self._cached_dict
+    
+    def rebuild(self) -> "MenuKeyboardButton":
+        """Drop the cached payload so the next :meth:`to_dict` recomputes it"""
+        self._cached_dict = None
+        return self
\ No newline at end of file
@@ -3,20 +3,35 @@
 # Kian Ahmadian <devs@python-bale-bot.ir>
 # All rights reserved.
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .menukeyboardbutton import MenuKeyboardButton
 
 class MenuKeyboardMarkup:
-    """Menu keyboard markup"""
+    """Menu keyboard markup
+
+    The keyboard is treated as immutable once serialized: :meth:`to_dict`
+    caches its result, so call :meth:`rebuild` after changing the buttons.
+    """
     
     def __init__(self, keyboard: List[List[MenuKeyboardButton]]):
         self.keyboard = keyboard
+        self._cached_dict: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            "keyboard": [
-                [button.to_dict() for button in row] 
-                for row in self.keyboard
-            ]
-        }
\ No newline at end of file
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "keyboard": [
+                    [button.to_dict() for button in row] 
+                    for row in self.keyboard
+                ]
+            }
+        return self._cached_dict
+    
+    def rebuild(self) -> "MenuKeyboardMarkup":
+        """Drop the cached payload of the keyboard and its buttons"""
+        self._cached_dict = None
+        for row in self.keyboard:
+            for button in row:
+                button.rebuild()
+        return self
\ No newline at end of file
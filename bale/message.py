@@ -10,6 +10,15 @@ from .chat import Chat
 class Message:
     """Message object"""
     
+    __slots__ = (
+        "message_id",
+        "from_user",
+        "chat",
+        "text",
+        "date"
+    )
+    _OPTIONAL_FIELDS = ("text", "date")
+    
     def __init__(self, message_id: int, from_user: Optional[User] = None, 
                  chat: Optional[Chat] = None, text: Optional[str] = None,
                  date: Optional[int] = None):
@@ -49,12 +58,7 @@ class Message:
         if self.chat:
             result["chat"] = self.chat.to_dict()
         
-        if self.text:
-            result["text"] = self.text
-        
-        if self.date:
-            result["date"] = self.date
-        
+        result.update({field: value for field in self._OPTIONAL_FIELDS if (value := getattr(self, field))})
         return result
     
     async def reply(self, text: str, **kwargs) -> 'Message':
@@ -8,11 +8,12 @@
 #
 # You should have received a copy of the GNU General Public License v2.0
 # along with this program. If not, see <https://www.gnu.org/licenses/gpl-2.0.html>.
-from typing import Any, Optional, Type
+from typing import Any, Optional, Type, Union
 
 import asyncio
 import aiohttp
 import logging
+import os
 from ssl import SSLCertVerificationError
 from bale.version import BALE_API_BASE_URL, BALE_API_FILE_URL
 from bale.utils.request import RequestParams
@@ -31,7 +32,8 @@ class Route:
         "base_url",
         "request_method",
         "endpoint",
-        "token"
+        "token",
+        "url"
     )
 
     def __init__(self, request_method: str, endpoint: str, token: str) -> None:
@@ -41,10 +43,7 @@ class Route:
         self.request_method = request_method
         self.endpoint = endpoint
         self.token = token
-
-    @property
-    def url(self):
-        return f"{self.base_url}/{self.endpoint}"
+        self.url = f"{self.base_url}/{endpoint}"
 
 
 def parse_form_data(value: Any):
@@ -53,13 +52,28 @@ def parse_form_data(value: Any):
     return value
 
 
+def add_form_field(form_data: aiohttp.FormData, key: str, value: Any) -> None:
+    # File objects are handed to aiohttp as-is so the body is streamed in
+    # chunks instead of being read into memory before the upload starts.
+    if hasattr(value, 'to_multipart_payload'):
+        form_data.add_field(key, **value.to_multipart_payload())
+    elif hasattr(value, 'read'):
+        form_data.add_field(key, value, filename=os.path.basename(getattr(value, 'name', key)),
+                            content_type='application/octet-stream')
+    else:
+        form_data.add_field(key, parse_form_data(value))
+
+
 class HTTPClient:
     """Send a Request to BALE API Server"""
 
     __slots__ = (
         "token",
         "__session",
-        "__extra"
+        "__extra",
+        "_routes",
+        "_headers",
+        "_json_headers"
     )
 
     def __init__(self, token: str, /, **kwargs) -> None:
@@ -71,47 +85,70 @@ class HTTPClient:
         self.__session = None
         self.token = token
         self.__extra = kwargs
+        self._routes = {}
+        # headers never change for a client, so build them once instead of per request
+        self._headers = {'User-Agent': self.user_agent}
+        self._json_headers = {**self._headers, 'Content-Type': 'application/json'}
 
     @property
     def user_agent(self) -> str:
         return "python-bale-bot (https://python-bale-bot.ir): An API wrapper for Bale written in Python"
 
+    def _route(self, request_method: str, endpoint: str) -> Route:
+        # Routes only depend on the method, the endpoint and the token, so each
+        # one is built once per client and reused for every later call.
+        key = (request_method, endpoint)
+        route = self._routes.get(key)
+        if route is None:
+            route = self._routes[key] = Route(request_method, endpoint, self.token)
+        return route
+
     def is_closed(self) -> bool:
         return self.__session is None
 
+    def _create_session(self) -> aiohttp.ClientSession:
+        # One long-lived session per client; its connector keeps a pool of
+        # keep-alive connections so calls don't pay a new TCP+TLS handshake.
+        connector_options = {
+            "limit": 100,
+            "keepalive_timeout": 75.0,
+            "ttl_dns_cache": 300,
+            **self.__extra
+        }
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**connector_options),
+            timeout=aiohttp.ClientTimeout(total=60)
+        )
+
     def reload_session(self) -> None:
         if self.__session and self.__session.closed:
-            self.__session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(keepalive_timeout=20.0,
-                                                                                  **self.__extra))
+            self.__session = self._create_session()
 
     async def start(self) -> None:
         if self.__session:
             raise RuntimeError("HTTPClient has already started.")
-        self.__session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(keepalive_timeout=20.0, **self.__extra))
+        self.__session = self._create_session()
 
     async def close(self) -> None:
         if self.__session:
             await self.__session.close()
             self.__session = None
 
-    async def request(self, route: Route, *, via_form_data: bool = False, **kwargs) -> ResponseParser:
+    async def request(self, route: Route, *, via_form_data: bool = False, parse_response: bool = True,
+                      **kwargs) -> Union[ResponseParser, bool]:
         url = route.url
         method = route.request_method
-        headers = { 'User-Agent': self.user_agent }
+        headers = self._headers
 
         if 'json' in kwargs:
-            headers['Content-Type'] = 'application/json'
+            headers = self._json_headers
             kwargs['data'] = to_json(kwargs.pop('json'))
 
         if via_form_data:
             form_data = aiohttp.FormData()
             if 'data' in kwargs:
                 for key, value in kwargs.pop('data', {}).items():
-                    if isinstance(value, InputFile):
-                        field_params = value.to_multipart_payload()
-                        form_data.add_field(key, **field_params)
-                    else:
-                        form_data.add_field(key, parse_form_data(value))
+                    add_form_field(form_data, key, value)
 
             kwargs['data'] = form_data
 
@@ -123,6 +160,9 @@ class HTTPClient:
                     original_response: aiohttp.ClientResponse
                     _log.debug('[%s] %s with %s has returned %s', method, url, kwargs.get('data'),
                                original_response.status)
+                    if not parse_response and original_response.status == ResponseStatusCode.OK:
+                        # the caller only needs to know the call succeeded; skip decoding the body
+                        return True
                     response = await ResponseParser.parse_response(original_response)
                     if original_response.status == ResponseStatusCode.OK:
                         return response
@@ -185,98 +225,100 @@ class HTTPClient:
         except Exception as error:
             raise HTTPException(error)
 
-    def send_message(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendMessage", self.token), json=params.payload)
+    def send_message(self, *, params: RequestParams, parse_response: bool = True):
+        return self.request(self._route("POST", "sendMessage"), json=params.payload,
+                            parse_response=parse_response)
 
     def forward_message(self, *, params: RequestParams):
-        return self.request(Route("POST", "forwardMessage", self.token), json=params.payload)
+        return self.request(self._route("POST", "forwardMessage"), json=params.payload)
 
     def send_document(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendDocument", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "sendDocument"), data=params.payload, via_form_data=True)
 
     def send_photo(self, *, params: RequestParams):
-        return self.request(Route("POST", "SendPhoto", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "SendPhoto"), data=params.payload, via_form_data=True)
 
     def send_media_group(self, *, params: RequestParams):
-        return self.request(Route("POST", "SendMediaGroup", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "SendMediaGroup"), data=params.payload, via_form_data=True)
 
     def send_video(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendVideo", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "sendVideo"), data=params.payload, via_form_data=True)
 
     def send_audio(self, *, params: RequestParams):
-        return self.request(Route("POST", "SendAudio", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "SendAudio"), data=params.payload, via_form_data=True)
 
     def send_contact(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendContact", self.token), data=params.payload)
+        return self.request(self._route("POST", "sendContact"), data=params.payload)
 
     def send_invoice(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendInvoice", self.token), json=params.payload)
+        return self.request(self._route("POST", "sendInvoice"), json=params.payload)
 
     def send_location(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendLocation", self.token), json=params.payload)
+        return self.request(self._route("POST", "sendLocation"), json=params.payload)
 
     def send_animation(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendAnimation", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "sendAnimation"), data=params.payload, via_form_data=True)
 
     def send_sticker(self, *, params: RequestParams):
-        return self.request(Route("POST", "sendSticker", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "sendSticker"), data=params.payload, via_form_data=True)
 
     def edit_message_text(self, *, params: RequestParams):
-        return self.request(Route("POST", "editMessageText", self.token), json=params.payload)
+        return self.request(self._route("POST", "editMessageText"), json=params.payload)
 
     def edit_message_caption(self, *, params: RequestParams):
-        return self.request(Route("POST", "editMessageCaption", self.token), json=params.payload)
+        return self.request(self._route("POST", "editMessageCaption"), json=params.payload)
 
     def copy_message(self, *, params: RequestParams):
-        return self.request(Route("POST", "copyMessage", self.token), json=params.payload)
+        return self.request(self._route("POST", "copyMessage"), json=params.payload)
 
     def delete_message(self, *, params: RequestParams):
-        return self.request(Route("GET", "deleteMessage", self.token), json=params.payload)
+        return self.request(self._route("GET", "deleteMessage"), json=params.payload)
 
     def get_updates(self, *, params: RequestParams):
-        return self.request(Route("POST", "getUpdates", self.token), json=params.payload)
+        return self.request(self._route("POST", "getUpdates"), json=params.payload)
 
     def get_webhook_info(self):
-        return self.request(Route("GET", "getWebhookInfo", self.token))
+        return self.request(self._route("GET", "getWebhookInfo"))
 
     def delete_webhook(self):
-        return self.request(Route("GET", "deleteWebhook", self.token))
+        return self.request(self._route("GET", "deleteWebhook"))
 
     def set_webhook(self, *, params: RequestParams):
-        return self.request(Route("POST", "setWebhook", self.token), json=params.payload)
+        return self.request(self._route("POST", "setWebhook"), json=params.payload)
 
     def get_me(self):
-        return self.request(Route("GET", "getMe", self.token))
+        return self.request(self._route("GET", "getMe"))
 
     def get_chat(self, *, params: RequestParams):
-        return self.request(Route("GET", "getChat", self.token), json=params.payload)
+        return self.request(self._route("GET", "getChat"), json=params.payload)
 
     def leave_chat(self, *, params: RequestParams):
-        return self.request(Route("GET", "leaveChat", self.token), json=params.payload)
+        return self.request(self._route("GET", "leaveChat"), json=params.payload)
 
     def get_chat_administrators(self, *, params: RequestParams):
-        return self.request(Route("GET", "getChatAdministrators", self.token), json=params.payload)
+        return self.request(self._route("GET", "getChatAdministrators"), json=params.payload)
 
     def get_chat_members_count(self, *, params: RequestParams):
-        return self.request(Route("GET", "getChatMembersCount", self.token), json=params.payload)
+        return self.request(self._route("GET", "getChatMembersCount"), json=params.payload)
 
     def get_chat_member(self, *, params: RequestParams):
-        return self.request(Route("GET", "getChatMember", self.token), json=params.payload)
+        return self.request(self._route("GET", "getChatMember"), json=params.payload)
 
     def set_chat_photo(self, *, params: RequestParams):
-        return self.request(Route("POST", "setChatPhoto", self.token), data=params.payload, via_form_data=True)
+        return self.request(self._route("POST", "setChatPhoto"), data=params.payload, via_form_data=True)
 
     def ban_chat_member(self, *, params: RequestParams):
-        return self.request(Route("POST", "banChatMember", self.token), json=params.payload)
+        return self.request(self._route("POST", "banChatMember"), json=params.payload)
 
     def unban_chat_member(self, *, params: RequestParams):
-        return self.request(Route("POST", "unbanChatMember", self.token), json=params.payload)
+        return self.request(self._route("POST", "unbanChatMember"), json=params.payload)
 
     def invite_user(self, *, params: RequestParams):
-        return self.request(Route("GET", "inviteUser", self.token), json=params.payload)
+        return self.request(self._route("GET", "inviteUser"), json=params.payload)
 
     def promote_chat_member(self, *, params: RequestParams):
-        return self.request(Route("POST", "promoteChatMember", self.token), json=params.payload)
+        return self.request(self._route("POST", "promoteChatMember"), json=params.payload)
 
     def answer_callback_query(self, *, params: RequestParams):
-        return self.request(Route("POST", "answerCallbackQuery", self.token), json=params.payload)
+        return self.request(self._route("POST", "answerCallbackQuery"), json=params.payload,
+                            parse_response=False)
@@ -10,6 +10,12 @@ from .callbackquery import CallbackQuery
 class Update:
     """Update object representing an incoming update"""
     
+    __slots__ = (
+        "update_id",
+        "message",
+        "callback_query"
+    )
+    
     def __init__(self, update_id: int, message: Optional[Message] = None, 
                  callback_query: Optional[CallbackQuery] = None):
         self.update_id = update_id
@@ -8,6 +8,15 @@ from typing import Any, Dict, Optional
 class User:
     """User object"""
     
+    __slots__ = (
+        "id",
+        "first_name",
+        "last_name",
+        "username",
+        "is_bot"
+    )
+    _OPTIONAL_FIELDS = ("last_name", "username")
+    
     def __init__(self, id: int, first_name: str, last_name: Optional[str] = None,
                  username: Optional[str] = None, is_bot: bool = False):
         self.id = id
@@ -34,13 +43,7 @@ class User:
             "first_name": self.first_name,
             "is_bot": self.is_bot
         }
-        
-        if self.last_name:
-            result["last_name"] = self.last_name
-        
-        if self.username:
-            result["username"] = self.username
-        
+        result.update({field: value for field in self._OPTIONAL_FIELDS if (value := getattr(self, field))})
         return result
     
     @property
@@ -4,9 +4,15 @@
 # All rights reserved.
 
 from typing import Any, Dict, Optional
-from enum import Enum
+from enum import IntEnum
 
-class ResponseStatusCode(Enum):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+class ResponseStatusCode(IntEnum):
     OK = 200
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
@@ -15,29 +21,34 @@ class ResponseStatusCode(Enum):
     INTERNAL_SERVER_ERROR = 500
 
 def to_json(data: Any) -> str:
-    """Convert data to JSON string"""
-    import json
+    """Convert data to JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
     return json.dumps(data)
 
+_ERROR_CLASSES = {
+    400: "BadRequest",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "NotFound"
+}
+
 def find_error_class(status_code: int) -> str:
     """Find error class based on status code"""
-    if status_code == 400:
-        return "BadRequest"
-    elif status_code == 401:
-        return "Unauthorized"
-    elif status_code == 403:
-        return "Forbidden"
-    elif status_code == 404:
-        return "NotFound"
-    elif status_code >= 500:
-        return "InternalServerError"
-    else:
-        return "APIError"
+    error_class = _ERROR_CLASSES.get(status_code)
+    if error_class is not None:
+        return error_class
+    return "InternalServerError" if status_code >= 500 else "APIError"
 
 class RequestParams:
     """Request parameters container"""
     def __init__(self, **kwargs):
         self.params = kwargs
     
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """The request body, as read by HTTPClient"""
+        return self.params
+    
     def to_dict(self) -> Dict[str, Any]:
         return self.params
\ No newline at end of file
@@ -4,35 +4,34 @@ Handles Bale messenger integration using the real Bale API
 """
 
 import asyncio
+import functools
 import logging
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
+import os
+from typing import Dict, List, Optional, Any, Callable, Tuple
 
 # Import the real Bale API
-from bale import Bot, Update, Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
+from bale import Bot, Update, Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, InputFile
 from bale.handlers import CommandHandler, MessageHandler, CallbackQueryHandler
-from bale.checks import ChatType
+
+from bale_api_base import BaseBaleAPI, User, HTTP_POOL_OPTIONS, ADMIN_STATUSES, DEFAULT_ALLOWED_UPDATES
+from utils.media import read_media
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class User:
-    """User data structure"""
-    id: str
-    username: str
-    first_name: str
-    last_name: Optional[str] = None
-    is_bot: bool = False
+@functools.lru_cache(maxsize=256)
+def _build_inline_keyboard(layout: Tuple[Tuple[Tuple[str, str], ...], ...]) -> InlineKeyboardMarkup:
+    """Build a keyboard from a hashable (text, callback_data) layout; static menus are built once"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(text=text, callback_data=callback_data) for text, callback_data in row]
+        for row in layout
+    ])
 
-class BaleAPI:
+class BaleAPI(BaseBaleAPI):
     """Bale API wrapper for the bot using real Bale API"""
     
     def __init__(self, token: str):
-        self.bot = Bot(token)
-        self.command_handlers: Dict[str, Callable] = {}
-        self.message_handlers: List[Callable] = []
-        self.callback_handlers: Dict[str, Callable] = {}
-        self.running = False
+        super().__init__(token)
+        self.bot = Bot(token, **HTTP_POOL_OPTIONS)
         
         # Register handlers with the bot
         self._register_handlers()
@@ -66,89 +65,62 @@ class BaleAPI:
                 return
             
             text = message.text.strip()
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
             
             # Extract command and args
             if text.startswith('/'):
-                command_parts = text.split(' ', 1)
-                command = command_parts[0]
-                args = command_parts[1] if len(command_parts) > 1 else ""
-                
                 # Find and execute command handler
-                if command in self.command_handlers:
+                entry, command, args = self._lookup_command(text)
+                if entry is not None:
+                    handler, is_async = entry
                     try:
-                        await self.command_handlers[command](message, args)
+                        if is_async:
+                            await handler(message, args)
+                        else:
+                            handler(message, args)
                     except Exception as e:
-                        logger.error(f"Error in command handler {command}: {e}")
-                        await self.send_message(chat_id, "❌ An error occurred processing your command.")
-                else:
+                        logger.error("Error in command handler %s: %s", command, e)
+                        self._spawn(self.send_message(str(message.chat.id), "❌ An error occurred processing your command."))
+                elif self._has_message_handlers:
                     # Try message handlers
-                    for handler in self.message_handlers:
-                        try:
-                            await handler(message)
-                        except Exception as e:
-                            logger.error(f"Error in message handler: {e}")
+                    await self._dispatch_message(message)
             
         except Exception as e:
-            logger.error(f"Error processing command: {e}")
+            logger.error("Error processing command: %s", e)
     
     async def _process_message(self, message: Message):
         """Process regular messages"""
         try:
-            if not message.text or message.text.startswith('/'):
+            if not self._has_message_handlers or not message.text or message.text.startswith('/'):
                 return
             
             # Process with message handlers
-            for handler in self.message_handlers:
-                try:
-                    await handler(message)
-                except Exception as e:
-                    logger.error(f"Error in message handler: {e}")
+            await self._dispatch_message(message)
                     
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
     
     async def _process_callback_query(self, callback_query: CallbackQuery):
         """Process callback queries"""
         try:
             data = callback_query.data
-            chat_id = str(callback_query.message.chat.id)
-            user_id = str(callback_query.from_user.id)
             
-            if data in self.callback_handlers:
+            entry, args = self._lookup_callback(data)
+            if entry is not None:
+                handler, is_async = entry
                 try:
-                    await self.callback_handlers[data](callback_query)
+                    if is_async:
+                        await handler(callback_query, *args)
+                    else:
+                        handler(callback_query, *args)
                 except Exception as e:
-                    logger.error(f"Error in callback handler {data}: {e}")
-                    await self.answer_callback_query(callback_query.id, "❌ An error occurred.")
+                    logger.error("Error in callback handler %s: %s", data, e)
+                    self._spawn(self.answer_callback_query(callback_query.id, "❌ An error occurred."))
                     
         except Exception as e:
-            logger.error(f"Error processing callback query: {e}")
-    
-    def command(self, command: str):
-        """Decorator for command handlers"""
-        def decorator(func):
-            self.command_handlers[command] = func
-            return func
-        return decorator
+            logger.error("Error processing callback query: %s", e)
     
-    def message_handler(self, func):
-        """Decorator for message handlers"""
-        self.message_handlers.append(func)
-        return func
-    
-    def callback_handler(self, callback_data: str):
-        """Decorator for callback handlers"""
-        def decorator(func):
-            self.callback_handlers[callback_data] = func
-            return func
-        return decorator
-    
-    async def send_message(self, chat_id: str, text: str, 
-                          reply_markup: Optional[Any] = None,
-                          parse_mode: str = "Markdown") -> bool:
-        """Send a text message"""
+    async def _send_message_now(self, chat_id: str, text: str,
+                                reply_markup: Optional[Any], parse_mode: str) -> bool:
         try:
             await self.bot.send_message(
                 chat_id=chat_id,
@@ -158,7 +130,7 @@ class BaleAPI:
             )
             return True
         except Exception as e:
-            logger.error(f"Failed to send message to {chat_id}: {e}")
+            logger.error("Failed to send message to %s: %s", chat_id, e)
             return False
     
     async def send_photo(self, chat_id: str, photo_path: str, 
@@ -166,31 +138,31 @@ class BaleAPI:
                         reply_markup: Optional[Any] = None) -> bool:
         """Send a photo"""
         try:
-            with open(photo_path, 'rb') as photo:
-                await self.bot.send_photo(
-                    chat_id=chat_id,
-                    photo=photo,
-                    caption=caption,
-                    reply_markup=reply_markup
-                )
+            photo = InputFile(await read_media(photo_path), filename=os.path.basename(photo_path))
+            await self.bot.send_photo(
+                chat_id=chat_id,
+                photo=photo,
+                caption=caption,
+                reply_markup=reply_markup
+            )
             return True
         except Exception as e:
-            logger.error(f"Failed to send photo to {chat_id}: {e}")
+            logger.error("Failed to send photo to %s: %s", chat_id, e)
             return False
     
     async def send_document(self, chat_id: str, document_path: str, 
                            caption: str = "") -> bool:
         """Send a document"""
         try:
-            with open(document_path, 'rb') as doc:
-                await self.bot.send_document(
-                    chat_id=chat_id,
-                    document=doc,
-                    caption=caption
-                )
+            doc = InputFile(await read_media(document_path), filename=os.path.basename(document_path))
+            await self.bot.send_document(
+                chat_id=chat_id,
+                document=doc,
+                caption=caption
+            )
             return True
         except Exception as e:
-            logger.error(f"Failed to send document to {chat_id}: {e}")
+            logger.error("Failed to send document to %s: %s", chat_id, e)
             return False
     
     async def edit_message_text(self, chat_id: str, message_id: int, text: str,
@@ -205,7 +177,7 @@ class BaleAPI:
             )
             return True
         except Exception as e:
-            logger.error(f"Failed to edit message in {chat_id}: {e}")
+            logger.error("Failed to edit message in %s: %s", chat_id, e)
             return False
     
     async def answer_callback_query(self, callback_query_id: str, text: str = "", 
@@ -219,16 +191,16 @@ class BaleAPI:
             )
             return True
         except Exception as e:
-            logger.error(f"Failed to answer callback query: {e}")
+            logger.error("Failed to answer callback query: %s", e)
             return False
     
     async def is_admin(self, chat_id: str, user_id: str) -> bool:
         """Check if user is admin in chat"""
         try:
             chat_member = await self.bot.get_chat_member(chat_id, user_id)
-            return chat_member.get("status") in ['creator', 'administrator']
+            return chat_member.get("status") in ADMIN_STATUSES
         except Exception as e:
-            logger.error(f"Failed to check admin status: {e}")
+            logger.error("Failed to check admin status: %s", e)
             return False
     
     async def get_chat_member(self, chat_id: str, user_id: str) -> Optional[Dict]:
@@ -236,31 +208,45 @@ class BaleAPI:
         try:
             return await self.bot.get_chat_member(chat_id, user_id)
         except Exception as e:
-            logger.error(f"Failed to get chat member: {e}")
+            logger.error("Failed to get chat member: %s", e)
             return None
     
     def create_inline_keyboard(self, buttons: List[List[Dict[str, str]]]) -> InlineKeyboardMarkup:
-        """Create inline keyboard markup"""
-        keyboard = []
-        for row in buttons:
-            keyboard_row = []
-            for button in row:
-                keyboard_row.append(InlineKeyboardButton(
-                    text=button['text'],
-                    callback_data=button['callback_data']
-                ))
-            keyboard.append(keyboard_row)
-        return InlineKeyboardMarkup(keyboard)
+        """Create inline keyboard markup
+
+        Identical layouts share one cached markup, so treat the result as read-only.
+        """
+        return _build_inline_keyboard(tuple(
+            tuple((button['text'], button['callback_data']) for button in row)
+            for row in buttons
+        ))
     
     async def process_update(self, update: Update):
         """Process incoming update"""
         try:
             if update.message:
-                await self._process_message(update.message)
+                if update.message.text and update.message.text.startswith('/'):
+                    await self._process_command(update.message)
+                else:
+                    await self._process_message(update.message)
             elif update.callback_query:
                 await self._process_callback_query(update.callback_query)
         except Exception as e:
-            logger.error(f"Error processing update: {e}")
+            logger.error("Error processing update: %s", e)
+    
+    def _update_chat_id(self, update: Update) -> Any:
+        """Chat an update belongs to"""
+        message = update.message or (update.callback_query.message if update.callback_query else None)
+        return message.chat.id if message and message.chat else None
+    
+    async def _on_polled_update(self, update_data: Dict[str, Any]):
+        """Update handler given to the bot's polling loop, which passes raw update dicts"""
+        try:
+            update = Update.from_dict(update_data)
+        except Exception as e:
+            logger.error("Error parsing update %s: %s", update_data.get("update_id"), e)
+            return
+        self._enqueue_update(update)
     
     async def start_polling(self, update_handler: Optional[Callable] = None,
                            allowed_updates: Optional[List[str]] = None):
@@ -268,27 +254,21 @@ class BaleAPI:
         logger.info("Starting Bale bot polling...")
         self.running = True
         
+        self._start_sender()
+        
         try:
             await self.bot.start_polling(
-                update_handler=update_handler or self.process_update,
-                allowed_updates=allowed_updates or ['message', 'callback_query']
+                update_handler=update_handler or self._on_polled_update,
+                allowed_updates=allowed_updates or DEFAULT_ALLOWED_UPDATES
             )
         except Exception as e:
-            logger.error(f"Error in polling: {e}")
+            logger.error("Error in polling: %s", e)
             raise
     
     async def stop_polling(self):
         """Stop polling"""
         logger.info("Stopping Bale bot polling...")
         self.running = False
-        await self.bot.stop_polling()
-    
-    def get_user_info(self, user) -> User:
-        """Extract user information from Bale user object"""
-        return User(
-            id=str(user.id),
-            username=user.username or "",
-            first_name=user.first_name or "",
-            last_name=user.last_name,
-            is_bot=user.is_bot
-        )
\ No newline at end of file
+        await self._wait_for_pending()
+        await self._stop_sender()
+        await self.bot.stop_polling()
\ No newline at end of file
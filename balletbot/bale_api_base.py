@@ -0,0 +1,469 @@
+"""
+Shared Bale API wrapper base for BalletBot: Outbreak Dominion
+Handler registration, command routing and per-chat update dispatch used by
+every BaleAPI implementation
+"""
+
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Any, Callable, Set, Tuple
+from dataclasses import dataclass
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+from config import REDIS_URL, REDIS_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# TCPConnector options for every BaleAPI HTTP session. Idle connections are
+# dropped after 60s, before the server's own 75s keep-alive timeout, so a
+# reused connection is never one the server already closed; DNS answers are
+# cached for five minutes and half-closed TLS transports are cleaned up.
+HTTP_POOL_OPTIONS = {
+    "limit": 100,
+    "limit_per_host": 32,
+    "keepalive_timeout": 60,
+    "ttl_dns_cache": 300,
+    "enable_cleanup_closed": True
+}
+
+# Chat member statuses with admin rights
+ADMIN_STATUSES: FrozenSet[str] = frozenset(("creator", "administrator"))
+
+# Update types polled for when the caller doesn't choose
+DEFAULT_ALLOWED_UPDATES: Tuple[str, ...] = ("message", "callback_query")
+
+# Bale allows about 30 messages per second per bot
+SEND_RATE_LIMIT = 30
+SEND_BATCH_SIZE = 30
+SEND_BATCH_WINDOW = 0.01
+# Plain replies to the same chat within one batch are joined into one message up to this length
+MAX_MESSAGE_LENGTH = 4096
+
+@dataclass(slots=True)
+class User:
+    """User data structure"""
+    id: str
+    username: str
+    first_name: str
+    last_name: Optional[str] = None
+    is_bot: bool = False
+
+# Lightweight stand-ins for the bale library's Message/CallbackQuery objects,
+# built from raw update dicts by the clients that don't use the library
+@dataclass(slots=True)
+class _Chat:
+    id: Any
+    type: str = "private"
+
+@dataclass(slots=True)
+class _User:
+    id: Any
+
+@dataclass(slots=True)
+class _Msg:
+    chat: _Chat
+    from_user: _User
+    text: Optional[str] = None
+
+@dataclass(slots=True)
+class _Callback:
+    id: Any
+    data: Optional[str]
+    message: _Msg
+
+class TokenBucket:
+    """Token bucket rate limiter"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+    
+    async def acquire(self, tokens: float = 1):
+        """Wait until ``tokens`` are available, then take them"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+async def _run_concurrently(sync_handlers: Tuple[Callable, ...],
+                            async_handlers: Tuple[Callable, ...], message: Any):
+    """Pass a message to several handlers; async ones run concurrently
+    
+    One handler's failure is logged without stopping the others.
+    """
+    for handler in sync_handlers:
+        try:
+            handler(message)
+        except Exception as e:
+            logger.error("Error in message handler: %s", e)
+    if async_handlers:
+        results = await asyncio.gather(*(handler(message) for handler in async_handlers),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error in message handler: %s", result)
+
+class BaseBaleAPI:
+    """Common base for the BaleAPI implementations"""
+    
+    def __init__(self, token: str):
+        self.token = token
+        # Handlers are stored as (func, is_async) pairs, classified once at registration
+        self.command_handlers: Dict[str, Tuple[Callable, bool]] = {}
+        # The same entries bucketed by the character after '/', so unknown
+        # commands are usually rejected without hashing the whole token
+        self._cmd_buckets: Dict[str, Dict[str, Tuple[Callable, bool]]] = {}
+        # Membership pre-check so unknown tokens are never interned
+        self._known_cmds: FrozenSet[str] = frozenset()
+        self.message_handlers: List[Tuple[Callable, bool]] = []
+        # Frozen copy of message_handlers for dispatch, rebuilt on registration
+        self._message_handlers_tuple: Tuple[Tuple[Callable, bool], ...] = ()
+        # Handlers registered with a pattern as (compiled search, func, is_async),
+        # tried in registration order
+        self._pattern_handlers: List[Tuple[Callable, Callable, bool]] = []
+        # Skips building a message object when nothing would receive it
+        self._has_message_handlers = False
+        self._dispatch_message = self._build_message_dispatch()
+        self.callback_handlers: Dict[str, Tuple[Callable, bool]] = {}
+        # ``prefix:*`` routes as (prefix, func, is_async), longest prefix first
+        self._callback_prefixes: List[Tuple[str, Callable, bool]] = []
+        self.running = False
+        # Per-chat update queues: a slow handler only holds up its own chat
+        self._chat_queues: Dict[Any, deque] = {}
+        self._chat_workers: Dict[Any, asyncio.Task] = {}
+        # Strong references to fire-and-forget replies until they finish
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Optional Redis connection shared by every bot process, created on first use
+        self._redis = None
+        # Outgoing messages are batched by a sender task while polling
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
+        self._send_limiter = TokenBucket(SEND_RATE_LIMIT, SEND_RATE_LIMIT)
+    
+    def command(self, command: str):
+        """Decorator for command handlers"""
+        def decorator(func):
+            # interned so lookups against interned tokens compare by identity
+            command_key = sys.intern(command)
+            entry = (func, asyncio.iscoroutinefunction(func))
+            self.command_handlers[command_key] = entry
+            self._cmd_buckets.setdefault(command_key[1:2], {})[command_key] = entry
+            self._known_cmds = frozenset(self.command_handlers)
+            return func
+        return decorator
+    
+    def message_handler(self, func: Optional[Callable] = None, *, pattern: Optional[str] = None):
+        """Decorator for message handlers
+        
+        ``@message_handler`` receives every message. ``@message_handler(pattern=...)``
+        only receives messages whose text matches the regex; of those, the first
+        registered pattern that matches wins.
+        """
+        # compiled up front so a bad pattern raises re.error before anything is registered
+        search = re.compile(pattern).search if pattern is not None else None
+        
+        def decorator(func):
+            entry = (func, asyncio.iscoroutinefunction(func))
+            if search is None:
+                self.message_handlers.append(entry)
+                self._message_handlers_tuple = tuple(self.message_handlers)
+            else:
+                self._pattern_handlers.append((search,) + entry)
+            self._has_message_handlers = True
+            self._dispatch_message = self._build_message_dispatch()
+            return func
+        if func is not None:
+            return decorator(func)
+        return decorator
+    
+    def callback_handler(self, callback_data: str):
+        """Decorator for callback handlers
+        
+        ``callback_data`` ending in ``*`` registers a prefix route: ``"buy:*"``
+        handles ``"buy:item42"`` and the handler gets the rest (``"item42"``)
+        as a second argument. Exact matches take precedence.
+        """
+        def decorator(func):
+            is_async = asyncio.iscoroutinefunction(func)
+            if callback_data.endswith('*'):
+                self._callback_prefixes.append((callback_data[:-1], func, is_async))
+                self._callback_prefixes.sort(key=lambda route: len(route[0]), reverse=True)
+            else:
+                self.callback_handlers[callback_data] = (func, is_async)
+            return func
+        return decorator
+    
+    def _lookup_command(self, text: str) -> Tuple[Optional[Tuple[Callable, bool]], str, str]:
+        """Split ``/command args`` and find its handler entry (None if unknown)"""
+        command, _, args = text.partition(' ')
+        bucket = self._cmd_buckets.get(text[1:2])
+        if bucket is None or command not in self._known_cmds:
+            # other bots' commands and typos: sys.intern would keep them alive forever
+            return None, command, args
+        return bucket.get(sys.intern(command)), command, args
+    
+    def _lookup_callback(self, data: Optional[str]) -> Tuple[Optional[Tuple[Callable, bool]], Tuple[str, ...]]:
+        """Find the handler entry for callback data and the extra handler arguments"""
+        entry = self.callback_handlers.get(data)
+        if entry is not None or not data:
+            return entry, ()
+        for prefix, func, is_async in self._callback_prefixes:
+            if data.startswith(prefix):
+                return (func, is_async), (data[len(prefix):],)
+        return None, ()
+    
+    def _build_message_dispatch(self) -> Callable:
+        """Build a dispatcher that passes a message to every message handler
+        
+        Rebuilt on each registration; the common zero- and one-handler cases get
+        closures with the handler bound directly instead of the generic loop.
+        """
+        handlers = self._message_handlers_tuple
+        
+        if self._pattern_handlers:
+            return self._build_pattern_dispatch(handlers)
+        
+        if not handlers:
+            async def dispatch(message: Any):
+                pass
+        elif len(handlers) == 1:
+            (handler, is_async), = handlers
+            if is_async:
+                async def dispatch(message: Any):
+                    try:
+                        await handler(message)
+                    except Exception as e:
+                        logger.error("Error in message handler: %s", e)
+            else:
+                async def dispatch(message: Any):
+                    try:
+                        handler(message)
+                    except Exception as e:
+                        logger.error("Error in message handler: %s", e)
+        else:
+            sync_handlers = tuple(handler for handler, is_async in handlers if not is_async)
+            async_handlers = tuple(handler for handler, is_async in handlers if is_async)
+            
+            async def dispatch(message: Any):
+                await _run_concurrently(sync_handlers, async_handlers, message)
+        
+        return dispatch
+    
+    def _build_pattern_dispatch(self, handlers: Tuple[Tuple[Callable, bool], ...]) -> Callable:
+        """Dispatcher for when pattern handlers exist: the first registered pattern
+        that matches picks a handler, which runs alongside the unfiltered handlers"""
+        pattern_handlers = tuple(self._pattern_handlers)
+        
+        sync_handlers = tuple(handler for handler, is_async in handlers if not is_async)
+        async_handlers = tuple(handler for handler, is_async in handlers if is_async)
+        
+        async def dispatch(message: Any):
+            text = message.text or ""
+            for search, handler, is_async in pattern_handlers:
+                if search(text) is not None:
+                    break
+            else:
+                await _run_concurrently(sync_handlers, async_handlers, message)
+                return
+            if is_async:
+                await _run_concurrently(sync_handlers, async_handlers + (handler,), message)
+            else:
+                await _run_concurrently(sync_handlers + (handler,), async_handlers, message)
+        
+        return dispatch
+    
+    async def process_update(self, update: Any):
+        """Process incoming update"""
+        raise NotImplementedError
+    
+    async def send_message(self, chat_id: str, text: str, 
+                          reply_markup: Optional[Any] = None,
+                          parse_mode: str = "Markdown") -> bool:
+        """Send a text message"""
+        if self._sender_task is None:
+            return await self._send_message_now(chat_id, text, reply_markup, parse_mode)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._send_queue.put_nowait((chat_id, text, reply_markup, parse_mode, future))
+        return await future
+    
+    async def _send_message_now(self, chat_id: str, text: str,
+                                reply_markup: Optional[Any], parse_mode: str) -> bool:
+        """Send one message immediately"""
+        raise NotImplementedError
+    
+    def _start_sender(self):
+        """Start batching send_message calls through the sender task"""
+        if self._sender_task is None:
+            self._send_queue = asyncio.Queue()
+            self._sender_task = asyncio.create_task(self._sender_loop())
+    
+    async def _sender_loop(self):
+        """Collect queued messages for a short window, then send them concurrently"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._send_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = loop.time() + SEND_BATCH_WINDOW
+            while len(batch) < SEND_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._send_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            groups = self._coalesce(batch)
+            await self._send_limiter.acquire(len(groups))
+            results = await asyncio.gather(*(self._send_message_now(*args) for args, _ in groups))
+            for (_, futures), result in zip(groups, results):
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
+    
+    @staticmethod
+    def _coalesce(batch: List[Tuple]) -> List[Tuple[List[Any], List[asyncio.Future]]]:
+        """Merge a batch's plain replies per chat into one message each
+        
+        Returns (send_message_now args, futures) pairs. Messages with a keyboard
+        are sent on their own and end the chat's current group.
+        """
+        groups: List[Tuple[List[Any], List[asyncio.Future]]] = []
+        open_groups: Dict[Any, Tuple[List[Any], List[asyncio.Future]]] = {}
+        for chat_id, text, reply_markup, parse_mode, future in batch:
+            group = open_groups.get(chat_id)
+            if reply_markup is not None:
+                open_groups.pop(chat_id, None)
+                groups.append(([chat_id, text, reply_markup, parse_mode], [future]))
+            elif (group is not None and group[0][3] == parse_mode
+                  and len(group[0][1]) + len(text) + 2 <= MAX_MESSAGE_LENGTH):
+                group[0][1] = f"{group[0][1]}\n\n{text}"
+                group[1].append(future)
+            else:
+                group = open_groups[chat_id] = ([chat_id, text, None, parse_mode], [future])
+                groups.append(group)
+        return groups
+    
+    async def _stop_sender(self):
+        """Flush queued messages and stop the sender task"""
+        task, self._sender_task = self._sender_task, None
+        if task is not None:
+            self._send_queue.put_nowait(None)
+            await task
+    
+    def _spawn(self, coro):
+        """Run a reply in the background so the handler path doesn't wait on it"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    def _update_chat_id(self, update: Dict[str, Any]) -> Any:
+        """Chat an update belongs to; raw API updates are dicts"""
+        source = update.get("message") or update.get("callback_query", {}).get("message") or {}
+        return source.get("chat", {}).get("id")
+    
+    def _enqueue_update(self, update: Any):
+        """Queue an update behind earlier updates from the same chat"""
+        chat_id = self._update_chat_id(update)
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            queue = self._chat_queues[chat_id] = deque()
+            self._chat_workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id, queue))
+        queue.append(update)
+    
+    async def _chat_worker(self, chat_id: Any, queue: deque):
+        """Handle one chat's updates in order; exits once the chat is idle"""
+        try:
+            while queue:
+                await self.process_update(queue.popleft())
+        finally:
+            del self._chat_queues[chat_id]
+            del self._chat_workers[chat_id]
+    
+    async def _wait_for_pending(self):
+        """Wait for chat workers and background replies to finish"""
+        if self._chat_workers:
+            await asyncio.gather(*self._chat_workers.values(), return_exceptions=True)
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+    
+    def _shared_cache(self):
+        """Redis client for cross-process caching, or None when not configured"""
+        if self._redis is None and REDIS_URL and aioredis is not None:
+            self._redis = aioredis.from_url(REDIS_URL)
+        return self._redis
+    
+    async def _get_shared_member(self, chat_id: str, user_id: str) -> Optional[Dict]:
+        """Chat member cached in Redis by any bot process, if present"""
+        redis = self._shared_cache()
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(f"cm:{chat_id}:{user_id}")
+        except Exception as e:
+            logger.warning("Redis lookup failed: %s", e)
+            return None
+        return json.loads(raw) if raw else None
+    
+    async def _set_shared_member(self, chat_id: str, user_id: str, member: Dict):
+        """Share a chat member lookup with other bot processes for REDIS_CACHE_TTL seconds"""
+        redis = self._shared_cache()
+        if redis is None:
+            return
+        try:
+            await redis.setex(f"cm:{chat_id}:{user_id}", REDIS_CACHE_TTL, json.dumps(member))
+        except Exception as e:
+            logger.warning("Redis store failed: %s", e)
+    
+    def get_user_info(self, user) -> User:
+        """Extract user information from Bale user object"""
+        if hasattr(user, 'id'):
+            return User(
+                id=str(user.id),
+                username=getattr(user, 'username', '') or "",
+                first_name=getattr(user, 'first_name', '') or "",
+                last_name=getattr(user, 'last_name', None),
+                is_bot=getattr(user, 'is_bot', False)
+            )
+        else:
+            # Mock user for testing
+            return User(
+                id="mock_user",
+                username="mock_user",
+                first_name="Mock",
+                last_name="User",
+                is_bot=False
+            )
+
+def make_bale_api(token: str) -> BaseBaleAPI:
+    """Create the BaleAPI implementation selected by ``config.USE_REAL_BALE_API``"""
+    import config
+    if config.USE_REAL_BALE_API:
+        from bale_api_real import BaleAPI
+    else:
+        from bale_api_simple import BaleAPI
+    return BaleAPI(token)
@@ -4,47 +4,132 @@ Handles Bale messenger integration using the actual Bale API
 """
 
 import asyncio
+import functools
 import logging
+import os
+import time
+import weakref
 import aiohttp
 import json
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
+import yarl
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from bale_api_base import (
+    BaseBaleAPI, User, HTTP_POOL_OPTIONS, ADMIN_STATUSES, DEFAULT_ALLOWED_UPDATES,
+    _Chat, _User, _Msg, _Callback
+)
+from utils.media import read_media
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class User:
-    """User data structure"""
-    id: str
-    username: str
-    first_name: str
-    last_name: Optional[str] = None
-    is_bot: bool = False
+# getUpdates long-poll timeout: the server holds the request open until an
+# update arrives or this many seconds pass
+POLLING_TIMEOUT = 20
+
+ADMIN_CACHE_TTL = 60
+ADMIN_CACHE_SIZE = 1024
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# One connection pool per event loop, shared by every BaleAPI instance on it,
+# so several bots (or a restarted session) reuse connections and DNS answers
+_SHARED_CONNECTORS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = weakref.WeakKeyDictionary()
+
+def _get_connector() -> aiohttp.TCPConnector:
+    """The running loop's shared TCPConnector, created on first use"""
+    loop = asyncio.get_running_loop()
+    connector = _SHARED_CONNECTORS.get(loop)
+    if connector is None or connector.closed:
+        connector = _SHARED_CONNECTORS[loop] = aiohttp.TCPConnector(**HTTP_POOL_OPTIONS)
+    return connector
 
-class BaleAPI:
+def _dumps(data: Any) -> bytes:
+    """Encode a request body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+def _loads(raw: bytes) -> Any:
+    """Decode a response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+@functools.lru_cache(maxsize=256)
+def _build_inline_keyboard(layout: Tuple[Tuple[Tuple[Tuple[str, Any], ...], ...], ...]) -> Dict:
+    """Build keyboard markup from a hashable layout of button items; static menus are built once"""
+    return {
+        "inline_keyboard": [[dict(button) for button in row] for row in layout]
+    }
+
+def _slim_update(update: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy just the fields process_update reads out of a raw update
+    
+    Queued updates can wait behind a busy chat; keeping only these fields lets
+    entities, reply_to_message, photo sizes and the rest be freed right away.
+    """
+    # channel posts and service messages have no "from", and callbacks on inline
+    # messages have no "message", so every nested field is read with a default
+    message = update.get("message")
+    if message is not None:
+        chat = message.get("chat", {})
+        return {"message": {
+            "text": message.get("text"),
+            # chat.type decides whether private-only commands may run
+            "chat": {"id": chat.get("id"), "type": chat.get("type")},
+            "from": {"id": message.get("from", {}).get("id")}
+        }}
+    callback_query = update.get("callback_query")
+    if callback_query is not None:
+        return {"callback_query": {
+            "id": callback_query.get("id"),
+            "data": callback_query.get("data"),
+            "message": {"chat": {"id": callback_query.get("message", {}).get("chat", {}).get("id")}},
+            "from": {"id": callback_query.get("from", {}).get("id")}
+        }}
+    return update
+
+class BaleAPI(BaseBaleAPI):
     """Real Bale API wrapper for the bot"""
     
     def __init__(self, token: str):
-        self.token = token
+        super().__init__(token)
         self.base_url = f"https://tapi.bale.ai/bot{token}"
+        # Parsed URL per API method, so aiohttp doesn't re-parse it on every call
+        self._endpoints: Dict[str, yarl.URL] = {}
         self.session: Optional[aiohttp.ClientSession] = None
-        self.command_handlers: Dict[str, Callable] = {}
-        self.message_handlers: List[Callable] = []
-        self.callback_handlers: Dict[str, Callable] = {}
-        self.running = False
         self.user: Optional[Dict] = None
+        # (chat_id, user_id) -> (checked_at, is_admin), bounded LRU
+        self._admin_cache: "OrderedDict[Tuple[str, str], Tuple[float, bool]]" = OrderedDict()
+        # The getUpdates long poll in flight, cancelled by stop_polling
+        self._poll_request: Optional[asyncio.Task] = None
+        # Update field -> coroutine that handles its payload
+        self._update_dispatch: Dict[str, Callable] = {
+            "message": self._process_message,
+            "callback_query": self._process_callback_query
+        }
         
     async def start(self):
         """Start the HTTP session"""
         if not self.session or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            # the session must not close the connector other instances still use
+            self.session = aiohttp.ClientSession(
+                connector=_get_connector(),
+                connector_owner=False
+            )
             
         # Get bot info
         try:
             self.user = await self.get_me()
-            logger.info(f"Bot started: {self.user.get('first_name', 'Unknown')}")
+            logger.info("Bot started: %s", self.user.get('first_name', 'Unknown'))
         except Exception as e:
-            logger.warning(f"Could not get bot info: {e}")
+            logger.warning("Could not get bot info: %s", e)
             self.user = {"first_name": "BalletBot", "username": "balletbot"}
     
     async def close(self):
@@ -52,24 +137,34 @@ class BaleAPI:
         if self.session and not self.session.closed:
             await self.session.close()
     
-    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+    def _url(self, endpoint: str) -> yarl.URL:
+        """URL of an API method, parsed once"""
+        url = self._endpoints.get(endpoint)
+        if url is None:
+            url = self._endpoints[endpoint] = yarl.URL(f"{self.base_url}/{endpoint}")
+        return url
+    
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                            timeout: Optional[aiohttp.ClientTimeout] = None) -> Dict[str, Any]:
         """Make a request to the Bale API"""
         if not self.session:
             await self.start()
             
-        url = f"{self.base_url}/{endpoint}"
+        url = self._url(endpoint)
         
         try:
-            async with self.session.request(method, url, json=data) as response:
-                result = await response.json()
+            body = _dumps(data) if data is not None else None
+            async with self.session.request(method, url, data=body, headers=JSON_HEADERS,
+                                            timeout=timeout) as response:
+                result = _loads(await response.read())
                 
                 if not response.ok:
-                    logger.error(f"API request failed: {response.status} - {result}")
+                    logger.error("API request failed: %s - %s", response.status, result)
                     raise Exception(f"API request failed: {response.status}")
                 
                 return result
         except Exception as e:
-            logger.error(f"Request failed: {e}")
+            logger.error("Request failed: %s", e)
             raise
     
     async def get_me(self) -> Dict[str, Any]:
@@ -89,13 +184,13 @@ class BaleAPI:
         if allowed_updates:
             data["allowed_updates"] = allowed_updates
         
-        response = await self._make_request("POST", "getUpdates", data)
+        # a long poll must outlive the server-side wait, not hit the session's default timeout
+        request_timeout = aiohttp.ClientTimeout(total=timeout + 10, sock_read=timeout + 5) if timeout else None
+        response = await self._make_request("POST", "getUpdates", data, timeout=request_timeout)
         return response.get("result", [])
     
-    async def send_message(self, chat_id: str, text: str, 
-                          reply_markup: Optional[Any] = None,
-                          parse_mode: str = "Markdown") -> bool:
-        """Send a text message"""
+    async def _send_message_now(self, chat_id: str, text: str,
+                                reply_markup: Optional[Any], parse_mode: str) -> bool:
         try:
             data = {
                 "chat_id": chat_id,
@@ -109,7 +204,7 @@ class BaleAPI:
             await self._make_request("POST", "sendMessage", data)
             return True
         except Exception as e:
-            logger.error(f"Failed to send message to {chat_id}: {e}")
+            logger.error("Failed to send message to %s: %s", chat_id, e)
             return False
     
     async def send_photo(self, chat_id: str, photo_path: str, 
@@ -119,24 +214,25 @@ class BaleAPI:
         try:
             data = aiohttp.FormData()
             data.add_field('chat_id', chat_id)
-            data.add_field('photo', open(photo_path, 'rb'), filename=photo_path)
+            data.add_field('photo', await read_media(photo_path), filename=os.path.basename(photo_path),
+                           content_type='application/octet-stream')
             
             if caption:
                 data.add_field('caption', caption)
             
             if reply_markup:
-                data.add_field('reply_markup', json.dumps(reply_markup if isinstance(reply_markup, dict) else reply_markup.to_dict()))
+                data.add_field('reply_markup', _dumps(reply_markup if isinstance(reply_markup, dict) else reply_markup.to_dict()).decode())
             
             if not self.session:
                 await self.start()
                 
-            url = f"{self.base_url}/sendPhoto"
+            url = self._url("sendPhoto")
             async with self.session.post(url, data=data) as response:
-                result = await response.json()
+                result = _loads(await response.read())
                 return response.ok and result.get("ok", False)
                 
         except Exception as e:
-            logger.error(f"Failed to send photo to {chat_id}: {e}")
+            logger.error("Failed to send photo to %s: %s", chat_id, e)
             return False
     
     async def send_document(self, chat_id: str, document_path: str, 
@@ -145,7 +241,8 @@ class BaleAPI:
         try:
             data = aiohttp.FormData()
             data.add_field('chat_id', chat_id)
-            data.add_field('document', open(document_path, 'rb'), filename=document_path)
+            data.add_field('document', await read_media(document_path), filename=os.path.basename(document_path),
+                           content_type='application/octet-stream')
             
             if caption:
                 data.add_field('caption', caption)
@@ -153,13 +250,13 @@ class BaleAPI:
             if not self.session:
                 await self.start()
                 
-            url = f"{self.base_url}/sendDocument"
+            url = self._url("sendDocument")
             async with self.session.post(url, data=data) as response:
-                result = await response.json()
+                result = _loads(await response.read())
                 return response.ok and result.get("ok", False)
                 
         except Exception as e:
-            logger.error(f"Failed to send document to {chat_id}: {e}")
+            logger.error("Failed to send document to %s: %s", chat_id, e)
             return False
     
     async def edit_message_text(self, chat_id: str, message_id: int, text: str,
@@ -178,7 +275,7 @@ class BaleAPI:
             await self._make_request("POST", "editMessageText", data)
             return True
         except Exception as e:
-            logger.error(f"Failed to edit message in {chat_id}: {e}")
+            logger.error("Failed to edit message in %s: %s", chat_id, e)
             return False
     
     async def answer_callback_query(self, callback_query_id: str, text: str = "", 
@@ -194,45 +291,69 @@ class BaleAPI:
             await self._make_request("POST", "answerCallbackQuery", data)
             return True
         except Exception as e:
-            logger.error(f"Failed to answer callback query: {e}")
+            logger.error("Failed to answer callback query: %s", e)
             return False
     
     async def is_admin(self, chat_id: str, user_id: str) -> bool:
         """Check if user is admin in chat"""
+        key = (str(chat_id), str(user_id))
+        cached = self._admin_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ADMIN_CACHE_TTL:
+            self._admin_cache.move_to_end(key)
+            return cached[1]
+        
         try:
+            member = await self._fetch_chat_member(chat_id, user_id)
+            is_admin = member.get("status") in ADMIN_STATUSES
+            self._admin_cache[key] = (time.monotonic(), is_admin)
+            self._admin_cache.move_to_end(key)
+            if len(self._admin_cache) > ADMIN_CACHE_SIZE:
+                self._admin_cache.popitem(last=False)
+            return is_admin
+        except Exception as e:
+            logger.error("Failed to check admin status: %s", e)
+            return False
+    
+    async def _fetch_chat_member(self, chat_id: str, user_id: str) -> Dict:
+        """getChatMember, served from the shared Redis cache when another process already asked"""
+        member = await self._get_shared_member(chat_id, user_id)
+        if member is None:
             data = {"chat_id": chat_id, "user_id": user_id}
             response = await self._make_request("POST", "getChatMember", data)
             member = response["result"]
-            return member.get("status") in ['creator', 'administrator']
-        except Exception as e:
-            logger.error(f"Failed to check admin status: {e}")
-            return False
+            await self._set_shared_member(chat_id, user_id, member)
+        return member
     
     async def get_chat_member(self, chat_id: str, user_id: str) -> Optional[Dict]:
         """Get chat member information"""
         try:
-            data = {"chat_id": chat_id, "user_id": user_id}
-            response = await self._make_request("POST", "getChatMember", data)
-            return response["result"]
+            return await self._fetch_chat_member(chat_id, user_id)
         except Exception as e:
-            logger.error(f"Failed to get chat member: {e}")
+            logger.error("Failed to get chat member: %s", e)
             return None
     
     def create_inline_keyboard(self, buttons: List[List[Dict[str, str]]]) -> Dict:
-        """Create inline keyboard markup"""
-        return {
-            "inline_keyboard": buttons
-        }
+        """Create inline keyboard markup
+        
+        Identical layouts share one cached markup, so treat the result as read-only.
+        """
+        return _build_inline_keyboard(tuple(
+            tuple(tuple(button.items()) for button in row)
+            for row in buttons
+        ))
     
     async def process_update(self, update: Dict[str, Any]):
         """Process incoming update"""
         try:
-            if "message" in update:
-                await self._process_message(update["message"])
-            elif "callback_query" in update:
-                await self._process_callback_query(update["callback_query"])
+            # an update has update_id plus one payload field; dispatch on the first known one
+            dispatch = self._update_dispatch
+            for key in update:
+                handler = dispatch.get(key)
+                if handler is not None:
+                    await handler(update[key])
+                    return
         except Exception as e:
-            logger.error(f"Error processing update: {e}")
+            logger.error("Error processing update: %s", e)
     
     async def _process_message(self, message: Dict[str, Any]):
         """Process incoming message"""
@@ -241,100 +362,60 @@ class BaleAPI:
                 return
             
             text = message["text"].strip()
-            chat_id = str(message["chat"]["id"])
-            user_id = str(message["from"]["id"])
             
-            # Check for commands
+            entry = None
             if text.startswith('/'):
-                command_parts = text.split(' ', 1)
-                command = command_parts[0]
-                args = command_parts[1] if len(command_parts) > 1 else ""
-                
-                if command in self.command_handlers:
-                    try:
-                        # Create mock message object
-                        mock_message = type('Message', (), {
-                            'chat': type('Chat', (), {'id': message["chat"]["id"]})(),
-                            'from_user': type('User', (), {'id': message["from"]["id"]})(),
-                            'text': message["text"]
-                        })()
-                        
-                        await self.command_handlers[command](mock_message, args)
-                    except Exception as e:
-                        logger.error(f"Error in command handler {command}: {e}")
-                        await self.send_message(chat_id, "❌ An error occurred processing your command.")
-                else:
-                    # Try message handlers
-                    for handler in self.message_handlers:
-                        try:
-                            mock_message = type('Message', (), {
-                                'chat': type('Chat', (), {'id': message["chat"]["id"]})(),
-                                'from_user': type('User', (), {'id': message["from"]["id"]})(),
-                                'text': message["text"]
-                            })()
-                            await handler(mock_message)
-                        except Exception as e:
-                            logger.error(f"Error in message handler: {e}")
+                entry, command, args = self._lookup_command(text)
+            
+            # Nothing to dispatch to, so skip building the message object
+            if entry is None and not self._has_message_handlers:
+                return
+            
+            # Message object shared by every handler of this update
+            chat = message["chat"]
+            mock_message = _Msg(_Chat(chat["id"], chat.get("type") or "private"), _User(message["from"]["id"]), message["text"])
+            
+            if entry is not None:
+                handler, is_async = entry
+                try:
+                    if is_async:
+                        await handler(mock_message, args)
+                    else:
+                        handler(mock_message, args)
+                except Exception as e:
+                    logger.error("Error in command handler %s: %s", command, e)
+                    self._spawn(self.send_message(str(message["chat"]["id"]), "❌ An error occurred processing your command."))
             else:
-                # Process as regular message
-                for handler in self.message_handlers:
-                    try:
-                        mock_message = type('Message', (), {
-                            'chat': type('Chat', (), {'id': message["chat"]["id"]})(),
-                            'from_user': type('User', (), {'id': message["from"]["id"]})(),
-                            'text': message["text"]
-                        })()
-                        await handler(mock_message)
-                    except Exception as e:
-                        logger.error(f"Error in message handler: {e}")
+                # Unknown command or regular message: try message handlers
+                await self._dispatch_message(mock_message)
                         
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
     
     async def _process_callback_query(self, callback_query: Dict[str, Any]):
         """Process callback query"""
         try:
             data = callback_query.get("data")
-            chat_id = str(callback_query["message"]["chat"]["id"])
-            user_id = str(callback_query["from"]["id"])
             
-            if data in self.callback_handlers:
+            entry, args = self._lookup_callback(data)
+            if entry is not None:
                 try:
-                    mock_callback = type('CallbackQuery', (), {
-                        'id': callback_query["id"],
-                        'data': data,
-                        'message': type('Message', (), {
-                            'chat': type('Chat', (), {'id': callback_query["message"]["chat"]["id"]})(),
-                            'from_user': type('User', (), {'id': callback_query["from"]["id"]})()
-                        })()
-                    })()
+                    mock_callback = _Callback(callback_query["id"], data, _Msg(
+                        _Chat(callback_query["message"]["chat"]["id"]),
+                        _User(callback_query["from"]["id"])
+                    ))
                     
-                    await self.callback_handlers[data](mock_callback)
+                    handler, is_async = entry
+                    if is_async:
+                        await handler(mock_callback, *args)
+                    else:
+                        handler(mock_callback, *args)
                 except Exception as e:
-                    logger.error(f"Error in callback handler {data}: {e}")
-                    await self.answer_callback_query(callback_query["id"], "❌ An error occurred.")
+                    logger.error("Error in callback handler %s: %s", data, e)
+                    self._spawn(self.answer_callback_query(callback_query["id"], "❌ An error occurred."))
                     
         except Exception as e:
-            logger.error(f"Error processing callback query: {e}")
-    
-    def command(self, command: str):
-        """Decorator for command handlers"""
-        def decorator(func):
-            self.command_handlers[command] = func
-            return func
-        return decorator
-    
-    def message_handler(self, func):
-        """Decorator for message handlers"""
-        self.message_handlers.append(func)
-        return func
-    
-    def callback_handler(self, callback_data: str):
-        """Decorator for callback handlers"""
-        def decorator(func):
-            self.callback_handlers[callback_data] = func
-            return func
-        return decorator
+            logger.error("Error processing callback query: %s", e)
     
     async def start_polling(self, update_handler: Optional[Callable] = None,
                            allowed_updates: Optional[List[str]] = None):
@@ -342,57 +423,63 @@ class BaleAPI:
         logger.info("Starting Bale bot polling...")
         self.running = True
         
+        self._start_sender()
+        
         try:
             await self.start()
             
             offset = 0
             while self.running:
                 try:
-                    updates = await self.get_updates(
+                    self._poll_request = asyncio.create_task(self.get_updates(
                         offset=offset, 
-                        allowed_updates=allowed_updates or ['message', 'callback_query']
-                    )
+                        timeout=POLLING_TIMEOUT,
+                        allowed_updates=allowed_updates or DEFAULT_ALLOWED_UPDATES
+                    ))
+                    try:
+                        updates = await self._poll_request
+                    except asyncio.CancelledError:
+                        if self.running:
+                            raise
+                        break  # cancelled by stop_polling
+                    finally:
+                        self._poll_request = None
                     
                     for update in updates:
-                        if update_handler:
-                            await update_handler(update)
-                        else:
-                            await self.process_update(update)
-                        
+                        # advance first: an update that fails here must not be fetched again forever
                         offset = update["update_id"] + 1
-                    
-                    await asyncio.sleep(1)  # Polling interval
+                        try:
+                            if update_handler:
+                                await update_handler(update)
+                            else:
+                                self._enqueue_update(_slim_update(update))
+                        except Exception as e:
+                            logger.error("Error handling update %s: %s", update["update_id"], e)
+                    # don't hold the raw batch through the next long poll
+                    updates = update = None
                     
                 except Exception as e:
-                    logger.error(f"Error in polling loop: {e}")
+                    if not self.running:
+                        break
+                    logger.error("Error in polling loop: %s", e)
                     await asyncio.sleep(5)  # Wait before retrying
                     
         except Exception as e:
-            logger.error(f"Error in polling: {e}")
+            logger.error("Error in polling: %s", e)
             raise
     
     async def stop_polling(self):
         """Stop polling"""
         logger.info("Stopping Bale bot polling...")
         self.running = False
+        # Cancel the long poll first so closing the session doesn't fail it mid-flight
+        request = self._poll_request
+        if request is not None and not request.done():
+            request.cancel()
+            try:
+                await request
+            except asyncio.CancelledError:
+                pass
+        await self._wait_for_pending()
+        await self._stop_sender()
         await self.close()
-    
-    def get_user_info(self, user) -> User:
-        """Extract user information from Bale user object"""
-        if hasattr(user, 'id'):
-            return User(
-                id=str(user.id),
-                username=getattr(user, 'username', '') or "",
-                first_name=getattr(user, 'first_name', '') or "",
-                last_name=getattr(user, 'last_name', None),
-                is_bot=getattr(user, 'is_bot', False)
-            )
-        else:
-            # Mock user for testing
-            return User(
-                id="mock_user",
-                username="mock_user",
-                first_name="Mock",
-                last_name="User",
-                is_bot=False
-            )
\ No newline at end of file
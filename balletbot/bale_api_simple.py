@@ -6,28 +6,18 @@ Handles Bale messenger integration using a simplified approach
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
 
-logger = logging.getLogger(__name__)
+from bale_api_base import BaseBaleAPI, User, _Chat, _User, _Msg
 
-@dataclass
-class User:
-    """User data structure"""
-    id: str
-    username: str
-    first_name: str
-    last_name: Optional[str] = None
-    is_bot: bool = False
+logger = logging.getLogger(__name__)
 
-class BaleAPI:
+class BaleAPI(BaseBaleAPI):
     """Simplified Bale API wrapper for the bot"""
     
     def __init__(self, token: str):
-        self.token = token
-        self.command_handlers: Dict[str, Callable] = {}
-        self.message_handlers: List[Callable] = []
-        self.callback_handlers: Dict[str, Callable] = {}
-        self.running = False
+        super().__init__(token)
+        # Set by stop_polling to wake the mock polling loop immediately
+        self._stopped = asyncio.Event()
         
         # Mock bot info for testing
         self.user = {
@@ -36,37 +26,19 @@ class BaleAPI:
             "username": "balletbot",
             "is_bot": True
         }
-        
-    def command(self, command: str):
-        """Decorator for command handlers"""
-        def decorator(func):
-            self.command_handlers[command] = func
-            return func
-        return decorator
-    
-    def message_handler(self, func):
-        """Decorator for message handlers"""
-        self.message_handlers.append(func)
-        return func
-    
-    def callback_handler(self, callback_data: str):
-        """Decorator for callback handlers"""
-        def decorator(func):
-            self.callback_handlers[callback_data] = func
-            return func
-        return decorator
     
     async def send_message(self, chat_id: str, text: str, 
                           reply_markup: Optional[Any] = None,
                           parse_mode: str = "Markdown") -> bool:
         """Send a text message"""
         try:
-            logger.info(f"[BALE API] Sending message to {chat_id}: {text[:100]}...")
-            if reply_markup:
-                logger.info(f"[BALE API] With reply markup: {reply_markup}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[BALE API] Sending message to %s: %.100s...", chat_id, text)
+                if reply_markup:
+                    logger.info("[BALE API] With reply markup: %s", reply_markup)
             return True
         except Exception as e:
-            logger.error(f"Failed to send message to {chat_id}: {e}")
+            logger.error("Failed to send message to %s: %s", chat_id, e)
             return False
     
     async def send_photo(self, chat_id: str, photo_path: str, 
@@ -74,99 +46,115 @@ class BaleAPI:
                         reply_markup: Optional[Any] = None) -> bool:
         """Send a photo"""
         try:
-            logger.info(f"[BALE API] Sending photo to {chat_id}: {photo_path}")
-            if caption:
-                logger.info(f"[BALE API] Caption: {caption}")
-            if reply_markup:
-                logger.info(f"[BALE API] With reply markup: {reply_markup}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[BALE API] Sending photo to %s: %s", chat_id, photo_path)
+                if caption:
+                    logger.info("[BALE API] Caption: %s", caption)
+                if reply_markup:
+                    logger.info("[BALE API] With reply markup: %s", reply_markup)
             return True
         except Exception as e:
-            logger.error(f"Failed to send photo to {chat_id}: {e}")
+            logger.error("Failed to send photo to %s: %s", chat_id, e)
             return False
     
     async def send_document(self, chat_id: str, document_path: str, 
                            caption: str = "") -> bool:
         """Send a document"""
         try:
-            logger.info(f"[BALE API] Sending document to {chat_id}: {document_path}")
-            if caption:
-                logger.info(f"[BALE API] Caption: {caption}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[BALE API] Sending document to %s: %s", chat_id, document_path)
+                if caption:
+                    logger.info("[BALE API] Caption: %s", caption)
             return True
         except Exception as e:
-            logger.error(f"Failed to send document to {chat_id}: {e}")
+            logger.error("Failed to send document to %s: %s", chat_id, e)
             return False
     
     async def edit_message_text(self, chat_id: str, message_id: int, text: str,
                                reply_markup: Optional[Any] = None) -> bool:
         """Edit message text"""
         try:
-            logger.info(f"[BALE API] Editing message {message_id} in {chat_id}: {text[:100]}...")
-            if reply_markup:
-                logger.info(f"[BALE API] With reply markup: {reply_markup}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[BALE API] Editing message %s in %s: %.100s...", message_id, chat_id, text)
+                if reply_markup:
+                    logger.info("[BALE API] With reply markup: %s", reply_markup)
             return True
         except Exception as e:
-            logger.error(f"Failed to edit message in {chat_id}: {e}")
+            logger.error("Failed to edit message in %s: %s", chat_id, e)
             return False
     
     async def answer_callback_query(self, callback_query_id: str, text: str = "", 
                                    show_alert: bool = False) -> bool:
         """Answer a callback query"""
         try:
-            logger.info(f"[BALE API] Answering callback query {callback_query_id}: {text}")
+            logger.info("[BALE API] Answering callback query %s: %s", callback_query_id, text)
             return True
         except Exception as e:
-            logger.error(f"Failed to answer callback query: {e}")
+            logger.error("Failed to answer callback query: %s", e)
             return False
     
     async def is_admin(self, chat_id: str, user_id: str) -> bool:
         """Check if user is admin in chat"""
         try:
-            logger.info(f"[BALE API] Checking admin status for {user_id} in {chat_id}")
+            logger.info("[BALE API] Checking admin status for %s in %s", user_id, chat_id)
             # Mock admin check - return True for testing
             return True
         except Exception as e:
-            logger.error(f"Failed to check admin status: {e}")
+            logger.error("Failed to check admin status: %s", e)
             return False
     
     async def get_chat_member(self, chat_id: str, user_id: str) -> Optional[Dict]:
         """Get chat member information"""
         try:
-            logger.info(f"[BALE API] Getting chat member {user_id} from {chat_id}")
+            logger.info("[BALE API] Getting chat member %s from %s", user_id, chat_id)
             return {"id": user_id, "status": "member"}
         except Exception as e:
-            logger.error(f"Failed to get chat member: {e}")
+            logger.error("Failed to get chat member: %s", e)
             return None
     
     def create_inline_keyboard(self, buttons: List[List[Dict[str, str]]]) -> Dict:
         """Create inline keyboard markup"""
-        logger.info(f"[BALE API] Creating inline keyboard with {len(buttons)} rows")
+        logger.info("[BALE API] Creating inline keyboard with %s rows", len(buttons))
         return {"keyboard": buttons}
     
     async def process_update(self, update: Dict[str, Any]):
         """Process incoming update"""
         try:
-            logger.info(f"[BALE API] Processing update: {update}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[BALE API] Processing update: %s", update)
             
             # Mock update processing
             if "message" in update:
                 message = update["message"]
-                if message.get("text", "").startswith("/"):
-                    # Handle command
-                    command = message["text"].split()[0]
-                    args = " ".join(message["text"].split()[1:]) if len(message["text"].split()) > 1 else ""
-                    
-                    if command in self.command_handlers:
-                        # Create mock message object
-                        mock_message = type('Message', (), {
-                            'chat': type('Chat', (), {'id': message.get("chat", {}).get("id", "123456789")})(),
-                            'from_user': type('User', (), {'id': message.get("from", {}).get("id", "987654321")})(),
-                            'text': message.get("text", "")
-                        })()
-                        
-                        await self.command_handlers[command](mock_message, args)
+                text = message.get("text", "")
+                
+                entry = None
+                if text.startswith("/"):
+                    entry, command, args = self._lookup_command(text)
+                
+                if entry is None and not self._has_message_handlers:
+                    return
+                
+                # Mock message object, built once for whichever handlers run
+                chat = message.get("chat", {})
+                mock_message = _Msg(
+                    _Chat(chat.get("id", "123456789"), chat.get("type", "private")),
+                    _User(message.get("from", {}).get("id", "987654321")),
+                    text
+                )
+                
+                if entry is not None:
+                    handler, is_async = entry
+                    if is_async:
+                        await handler(mock_message, args)
+                    else:
+                        handler(mock_message, args)
+                else:
+                    # Unknown command or regular message, as in the real clients
+                    await self._dispatch_message(mock_message)
             
         except Exception as e:
-            logger.error(f"Error processing update: {e}")
+            logger.error("Error processing update: %s", e)
     
     async def start_polling(self, update_handler: Optional[Callable] = None,
                            allowed_updates: Optional[List[str]] = None):
@@ -179,35 +167,34 @@ class BaleAPI:
             logger.info("Bale bot polling started (mock mode)")
             
             # In a real implementation, this would start the actual polling loop
-            # For now, we'll just simulate it
-            while self.running:
-                await asyncio.sleep(1)
+            # For now, we'll just wait until polling is stopped. The flag is only
+            # reset once a stop has been seen, so a stop_polling that lands
+            # before this task first runs still ends it.
+            await self._stopped.wait()
+            self._stopped.clear()
+            self.running = False
                 
         except Exception as e:
-            logger.error(f"Error in polling: {e}")
+            logger.error("Error in polling: %s", e)
             raise
     
     async def stop_polling(self):
         """Stop polling"""
         logger.info("Stopping Bale bot polling...")
         self.running = False
+        self._stopped.set()
+        await self._wait_for_pending()
     
-    def get_user_info(self, user) -> User:
-        """Extract user information from Bale user object"""
-        if hasattr(user, 'id'):
-            return User(
-                id=str(user.id),
-                username=getattr(user, 'username', '') or "",
-                first_name=getattr(user, 'first_name', '') or "",
-                last_name=getattr(user, 'last_name', None),
-                is_bot=getattr(user, 'is_bot', False)
-            )
-        else:
-            # Mock user for testing
-            return User(
-                id="mock_user",
-                username="mock_user",
-                first_name="Mock",
-                last_name="User",
-                is_bot=False
-            )
\ No newline at end of file
+    async def simulate_burst(self, text: str, count: int, chats: int = 1):
+        """Feed ``count`` copies of ``text`` through the per-chat update queues at once
+
+        Updates are spread round-robin over ``chats`` chat ids, and this returns once
+        every chat worker has drained, which makes it a quick load test for handlers.
+        """
+        for i in range(count):
+            chat_id = 100000 + i % chats
+            self._enqueue_update({
+                "update_id": i,
+                "message": {"text": text, "chat": {"id": chat_id}, "from": {"id": chat_id}}
+            })
+        await self._wait_for_pending()
\ No newline at end of file
@@ -2,9 +2,16 @@
 Configuration settings for BalletBot: Outbreak Dominion
 """
 
+import sys
+from array import array
+from pathlib import Path
+from types import MappingProxyType
+
 # Bot Configuration
 BOT_TOKEN = "YOUR_BALE_BOT_TOKEN_HERE"  # Replace with actual token
 USE_REAL_BALE_API = True  # Set to False for mock mode during development
+REDIS_URL = None  # e.g. "redis://localhost:6379/0" to share chat member lookups between bot processes
+REDIS_CACHE_TTL = 60  # Seconds a shared chat member lookup stays valid
 
 # Time Configuration
 TIME_MULTIPLIER = 1  # For dev/testing: 0.1 = 10x faster, 10 = 10x slower
@@ -85,142 +92,150 @@ ITEM_TYPES = [
     "tool", "med", "ammo", "food", "misc"
 ]
 
-# World Regions
-WORLD_REGIONS = {
-    "Forest": {
-        "type": "forest",
-        "danger": 20,
-        "zombies": 0,
-        "connected": ["Urban", "Coast"],
-        "buildings": [],
-        "properties": {"loot_modifier": 1.0}
-    },
-    "Urban": {
-        "type": "urban", 
-        "danger": 40,
-        "zombies": 0,
-        "connected": ["Forest", "Downtown"],
-        "buildings": ["Warehouse", "Shop"],
-        "properties": {"loot_modifier": 1.2}
-    },
-    "Downtown": {
-        "type": "urban",
-        "danger": 60,
-        "zombies": 0,
-        "connected": ["Urban", "Military"],
-        "buildings": ["Hospital", "Office", "Mall"],
-        "properties": {"loot_modifier": 1.5}
-    },
-    "Military": {
-        "type": "military",
-        "danger": 80,
-        "zombies": 0,
-        "connected": ["Downtown", "Coast"],
-        "buildings": ["Base", "Armory", "Command"],
-        "properties": {"loot_modifier": 2.0, "mutant_chance": 0.3}
-    },
-    "Coast": {
-        "type": "coast",
-        "danger": 30,
-        "zombies": 0,
-        "connected": ["Forest", "Military"],
-        "buildings": ["Lighthouse", "Dock"],
-        "properties": {"loot_modifier": 1.1}
-    }
-}
+# World Regions (built on first access, see __getattr__ below)
+def _build_world_regions():
+    return _freeze({
+        "Forest": {
+            "type": "forest",
+            "danger": 20,
+            "zombies": 0,
+            "connected": ["Urban", "Coast"],
+            "buildings": [],
+            "properties": {"loot_modifier": 1.0}
+        },
+        "Urban": {
+            "type": "urban", 
+            "danger": 40,
+            "zombies": 0,
+            "connected": ["Forest", "Downtown"],
+            "buildings": ["Warehouse", "Shop"],
+            "properties": {"loot_modifier": 1.2}
+        },
+        "Downtown": {
+            "type": "urban",
+            "danger": 60,
+            "zombies": 0,
+            "connected": ["Urban", "Military"],
+            "buildings": ["Hospital", "Office", "Mall"],
+            "properties": {"loot_modifier": 1.5}
+        },
+        "Military": {
+            "type": "military",
+            "danger": 80,
+            "zombies": 0,
+            "connected": ["Downtown", "Coast"],
+            "buildings": ["Base", "Armory", "Command"],
+            "properties": {"loot_modifier": 2.0, "mutant_chance": 0.3}
+        },
+        "Coast": {
+            "type": "coast",
+            "danger": 30,
+            "zombies": 0,
+            "connected": ["Forest", "Military"],
+            "buildings": ["Lighthouse", "Dock"],
+            "properties": {"loot_modifier": 1.1}
+        }
+    })
 
-# Building Floors
-BUILDING_FLOORS = {
-    "Hospital": [
-        {"floor": 1, "difficulty": 30, "zombies": 2, "loot_table": "hospital_floor_1"},
-        {"floor": 2, "difficulty": 45, "zombies": 3, "loot_table": "hospital_floor_2"},
-        {"floor": 3, "difficulty": 60, "zombies": 4, "loot_table": "hospital_floor_3"},
-        {"floor": 4, "difficulty": 75, "zombies": 5, "loot_table": "hospital_floor_4"}
-    ],
-    "Office": [
-        {"floor": 1, "difficulty": 25, "zombies": 1, "loot_table": "office_floor_1"},
-        {"floor": 2, "difficulty": 35, "zombies": 2, "loot_table": "office_floor_2"},
-        {"floor": 3, "difficulty": 50, "zombies": 3, "loot_table": "office_floor_3"}
-    ],
-    "Mall": [
-        {"floor": 1, "difficulty": 40, "zombies": 3, "loot_table": "mall_floor_1"},
-        {"floor": 2, "difficulty": 55, "zombies": 4, "loot_table": "mall_floor_2"},
-        {"floor": 3, "difficulty": 70, "zombies": 5, "loot_table": "mall_floor_3"}
-    ],
-    "Base": [
-        {"floor": 1, "difficulty": 60, "zombies": 4, "loot_table": "base_floor_1"},
-        {"floor": 2, "difficulty": 80, "zombies": 6, "loot_table": "base_floor_2"},
-        {"floor": 3, "difficulty": 100, "zombies": 8, "loot_table": "base_floor_3"}
-    ]
-}
+# Building Floors (built on first access, see __getattr__ below)
+def _build_building_floors():
+    return _freeze({
+        "Hospital": [
+            {"floor": 1, "difficulty": 30, "zombies": 2, "loot_table": "hospital_floor_1"},
+            {"floor": 2, "difficulty": 45, "zombies": 3, "loot_table": "hospital_floor_2"},
+            {"floor": 3, "difficulty": 60, "zombies": 4, "loot_table": "hospital_floor_3"},
+            {"floor": 4, "difficulty": 75, "zombies": 5, "loot_table": "hospital_floor_4"}
+        ],
+        "Office": [
+            {"floor": 1, "difficulty": 25, "zombies": 1, "loot_table": "office_floor_1"},
+            {"floor": 2, "difficulty": 35, "zombies": 2, "loot_table": "office_floor_2"},
+            {"floor": 3, "difficulty": 50, "zombies": 3, "loot_table": "office_floor_3"}
+        ],
+        "Mall": [
+            {"floor": 1, "difficulty": 40, "zombies": 3, "loot_table": "mall_floor_1"},
+            {"floor": 2, "difficulty": 55, "zombies": 4, "loot_table": "mall_floor_2"},
+            {"floor": 3, "difficulty": 70, "zombies": 5, "loot_table": "mall_floor_3"}
+        ],
+        "Base": [
+            {"floor": 1, "difficulty": 60, "zombies": 4, "loot_table": "base_floor_1"},
+            {"floor": 2, "difficulty": 80, "zombies": 6, "loot_table": "base_floor_2"},
+            {"floor": 3, "difficulty": 100, "zombies": 8, "loot_table": "base_floor_3"}
+        ]
+    })
 
-# Vehicle Types
-VEHICLE_TYPES = {
-    "bike": {
-        "name": "Bicycle",
-        "condition_max": 100,
-        "fuel_capacity": 0,
-        "storage": 5,
-        "speed": 1,
-        "repair_cost": {"metal": 2}
-    },
-    "jeep": {
-        "name": "Jeep",
-        "condition_max": 100,
-        "fuel_capacity": 50,
-        "storage": 20,
-        "speed": 3,
-        "repair_cost": {"metal": 5, "circuit": 1}
-    },
-    "truck": {
-        "name": "Truck",
-        "condition_max": 100,
-        "fuel_capacity": 100,
-        "storage": 50,
-        "speed": 2,
-        "repair_cost": {"metal": 10, "circuit": 2}
-    },
-    "tank": {
-        "name": "Tank",
-        "condition_max": 100,
-        "fuel_capacity": 200,
-        "storage": 100,
-        "speed": 1,
-        "repair_cost": {"steel": 20, "circuit": 5}
-    },
-    "heli": {
-        "name": "Helicopter",
-        "condition_max": 100,
-        "fuel_capacity": 150,
-        "storage": 30,
-        "speed": 5,
-        "repair_cost": {"steel": 15, "circuit": 8}
-    },
-    "warship": {
-        "name": "Warship",
-        "condition_max": 100,
-        "fuel_capacity": 500,
-        "storage": 200,
-        "speed": 2,
-        "repair_cost": {"steel": 50, "circuit": 20}
-    }
-}
+# Vehicle Types (built on first access, see __getattr__ below)
+def _build_vehicle_types():
+    return _freeze({
+        "bike": {
+            "name": "Bicycle",
+            "condition_max": 100,
+            "fuel_capacity": 0,
+            "storage": 5,
+            "speed": 1,
+            "repair_cost": {"metal": 2}
+        },
+        "jeep": {
+            "name": "Jeep",
+            "condition_max": 100,
+            "fuel_capacity": 50,
+            "storage": 20,
+            "speed": 3,
+            "repair_cost": {"metal": 5, "circuit": 1}
+        },
+        "truck": {
+            "name": "Truck",
+            "condition_max": 100,
+            "fuel_capacity": 100,
+            "storage": 50,
+            "speed": 2,
+            "repair_cost": {"metal": 10, "circuit": 2}
+        },
+        "tank": {
+            "name": "Tank",
+            "condition_max": 100,
+            "fuel_capacity": 200,
+            "storage": 100,
+            "speed": 1,
+            "repair_cost": {"steel": 20, "circuit": 5}
+        },
+        "heli": {
+            "name": "Helicopter",
+            "condition_max": 100,
+            "fuel_capacity": 150,
+            "storage": 30,
+            "speed": 5,
+            "repair_cost": {"steel": 15, "circuit": 8}
+        },
+        "warship": {
+            "name": "Warship",
+            "condition_max": 100,
+            "fuel_capacity": 500,
+            "storage": 200,
+            "speed": 2,
+            "repair_cost": {"steel": 50, "circuit": 20}
+        }
+    })
+
+# File Paths (interned, so comparisons against them are usually identity checks)
+DATA_DIR = Path("data")
+PLAYERS_FILE = sys.intern(str(DATA_DIR / "players.txt"))
+INVENTORIES_FILE = sys.intern(str(DATA_DIR / "inventories.txt"))
+WORLD_FILE = sys.intern(str(DATA_DIR / "world.txt"))
+BUILDINGS_FILE = sys.intern(str(DATA_DIR / "buildings.txt"))
+VEHICLES_FILE = sys.intern(str(DATA_DIR / "vehicles.txt"))
+PENDING_ACTIONS_FILE = sys.intern(str(DATA_DIR / "pending_actions.txt"))
+CONSTRUCTION_FILE = sys.intern(str(DATA_DIR / "construction.txt"))
+EVENTS_FILE = sys.intern(str(DATA_DIR / "events.txt"))
+LOGS_FILE = sys.intern(str(DATA_DIR / "logs.txt"))
 
-# File Paths
-DATA_DIR = "data"
-PLAYERS_FILE = f"{DATA_DIR}/players.txt"
-INVENTORIES_FILE = f"{DATA_DIR}/inventories.txt"
-WORLD_FILE = f"{DATA_DIR}/world.txt"
-BUILDINGS_FILE = f"{DATA_DIR}/buildings.txt"
-VEHICLES_FILE = f"{DATA_DIR}/vehicles.txt"
-PENDING_ACTIONS_FILE = f"{DATA_DIR}/pending_actions.txt"
-CONSTRUCTION_FILE = f"{DATA_DIR}/construction.txt"
-EVENTS_FILE = f"{DATA_DIR}/events.txt"
-LOGS_FILE = f"{DATA_DIR}/logs.txt"
+# Game Data Paths
+RECIPES_PATH = sys.intern(str(DATA_DIR / "recipes.json"))
+ITEMS_PATH = sys.intern(str(DATA_DIR / "items.json"))
+DATABASE_PATH = sys.intern(str(DATA_DIR / "balletbot.db"))  # SQLite store used by utils.db
 
 # Asset Paths
-MAP_OVERVIEW_PATH = f"{DATA_DIR}/assets/map_overview.png"
-MAP_DETAILED_PATH = f"{DATA_DIR}/assets/map_detailed.png"
+MAP_OVERVIEW_PATH = sys.intern(str(DATA_DIR / "assets" / "map_overview.png"))
+MAP_DETAILED_PATH = sys.intern(str(DATA_DIR / "assets" / "map_detailed.png"))
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
@@ -231,6 +246,7 @@ LOG_FILE = "logs/balletbot.log"
 MAX_PLAYERS_PER_GAME = 50
 MAX_ACTIONS_HISTORY = 50
 GAME_CODE_LENGTH = 6
+GAME_CODE_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 
 # Safety Settings
 RATE_LIMIT_WINDOW = 60  # seconds
@@ -239,4 +255,104 @@ ADMIN_CONFIRMATION_REQUIRED = True
 
 # Debug Settings
 DEBUG_MODE = False
-SIMULATION_MODE = False
\ No newline at end of file
+SIMULATION_MODE = False
+
+def get_scaled_duration(seconds: float) -> int:
+    """Real-time duration in seconds scaled by TIME_MULTIPLIER"""
+    return int(seconds * TIME_MULTIPLIER)
+
+def get_scaled_days(days: float) -> int:
+    """Length of ``days`` game days in (scaled) seconds"""
+    return int(days * DAY_LENGTH_SECONDS)
+
+def _freeze(value):
+    """Read-only copy of a nested config literal: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def thaw(value):
+    """Plain dict/list copy of a frozen config entry, for code that mutates or saves it"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+# The game tables are shared by every system and must never be edited in place
+CLASS_BONUSES = _freeze(CLASS_BONUSES)
+ACTION_COOLDOWNS = _freeze(ACTION_COOLDOWNS)
+
+# CLASS_BONUSES flattened per attribute, so a bonus is one lookup by class name
+# (0 for classes without that bonus)
+def _class_bonus_column(attribute: str):
+    return MappingProxyType({
+        char_class: bonuses.get(attribute, 0) for char_class, bonuses in CLASS_BONUSES.items()
+    })
+
+BONUS_LOOT_YIELD = _class_bonus_column("loot_yield")
+BONUS_STEALTH = _class_bonus_column("stealth")
+BONUS_CRAFTING_SPEED = _class_bonus_column("crafting_speed")
+BONUS_INTELLIGENCE_GAIN = _class_bonus_column("intelligence_gain")
+BONUS_WEAPON_DAMAGE = _class_bonus_column("weapon_damage")
+BONUS_HEALTH = _class_bonus_column("health")
+
+def _build_region_graph():
+    """Region graph by integer id (position in WORLD_REGIONS), for code that
+    walks neighbours or compares regions without string lookups"""
+    regions = __getattr__("WORLD_REGIONS")
+    names = tuple(regions)
+    ids = MappingProxyType({name: region_id for region_id, name in enumerate(names)})
+    return {
+        "REGION_NAMES": names,
+        "REGION_IDS": ids,
+        "REGION_ADJ": tuple(
+            tuple(ids[neighbour] for neighbour in regions[name]["connected"])
+            for name in names
+        ),
+        "REGION_DANGER": array('B', (regions[name]["danger"] for name in names))
+    }
+
+def _build_floor_columns():
+    """Per-building floor difficulty and zombie counts as compact byte arrays,
+    for aggregate checks that don't need the full floor records"""
+    buildings = __getattr__("BUILDING_FLOORS")
+    return {
+        "FLOORS_DIFFICULTY": MappingProxyType({
+            name: array('B', (floor["difficulty"] for floor in floors)) for name, floors in buildings.items()
+        }),
+        "FLOORS_ZOMBIES": MappingProxyType({
+            name: array('B', (floor["zombies"] for floor in floors)) for name, floors in buildings.items()
+        })
+    }
+
+# Large tables are only built when first used, so importing config for a few
+# settings (BOT_TOKEN, LOG_LEVEL, ...) doesn't pay for them
+_LAZY_TABLES = {
+    "WORLD_REGIONS": lambda: {"WORLD_REGIONS": _build_world_regions()},
+    "BUILDING_FLOORS": lambda: {"BUILDING_FLOORS": _build_building_floors()},
+    "VEHICLE_TYPES": lambda: {"VEHICLE_TYPES": _build_vehicle_types()},
+    "REGION_NAMES": _build_region_graph,
+    "REGION_IDS": _build_region_graph,
+    "REGION_ADJ": _build_region_graph,
+    "REGION_DANGER": _build_region_graph,
+    "FLOORS_DIFFICULTY": _build_floor_columns,
+    "FLOORS_ZOMBIES": _build_floor_columns
+}
+
+def __getattr__(name: str):
+    """Build a lazy table on first access and keep it as a module global (PEP 562)"""
+    if name in globals():
+        return globals()[name]
+    builder = _LAZY_TABLES.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals().update(builder())
+    return globals()[name]
+
+# Cooldowns with TIME_MULTIPLIER already applied, for per-action checks
+SCALED_ACTION_COOLDOWNS = MappingProxyType({
+    action: get_scaled_duration(seconds) for action, seconds in ACTION_COOLDOWNS.items()
+})
\ No newline at end of file
@@ -3,20 +3,84 @@ Event system for BalletBot: Outbreak Dominion
 Handles game events and notifications
 """
 
+import asyncio
+import heapq
 import logging
-from typing import Dict, List, Optional, Any, Callable
+from collections import defaultdict, deque
+from itertools import count, islice
+from typing import Deque, Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass
+from enum import IntEnum, auto
 from datetime import datetime
 
+from config import MAX_PLAYERS_PER_GAME, MAX_COMMANDS_PER_WINDOW, RATE_LIMIT_WINDOW
 from utils.helpers import get_current_timestamp
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+class EventType(IntEnum):
+    """Common event types"""
+    PLAYER_CREATED = auto()
+    PLAYER_DIED = auto()
+    PLAYER_MOVED = auto()
+    COMBAT_STARTED = auto()
+    COMBAT_ENDED = auto()
+    ZOMBIE_SPAWNED = auto()
+    ZOMBIE_KILLED = auto()
+    ITEM_CRAFTED = auto()
+    BUILDING_ENTERED = auto()
+    FLOOR_CLEARED = auto()
+    VEHICLE_CREATED = auto()
+    VEHICLE_MOVED = auto()
+    RADIO_MESSAGE = auto()
+    SPOTTER_USED = auto()
+    CONSTRUCTION_STARTED = auto()
+    CONSTRUCTION_COMPLETED = auto()
+    OFFLINE_MODE_SET = auto()
+    AMBUSH_TRIGGERED = auto()
+    SCAVENGE_SUCCESS = auto()
+    MAP_PURCHASED = auto()
+    INTEL_GATHERED = auto()
+
+EVENT_TYPE_DESCRIPTIONS: Dict[EventType, str] = {
+    EventType.PLAYER_CREATED: "Player character created",
+    EventType.PLAYER_DIED: "Player died",
+    EventType.PLAYER_MOVED: "Player moved to new location",
+    EventType.COMBAT_STARTED: "Combat initiated",
+    EventType.COMBAT_ENDED: "Combat finished",
+    EventType.ZOMBIE_SPAWNED: "Zombie spawned",
+    EventType.ZOMBIE_KILLED: "Zombie killed",
+    EventType.ITEM_CRAFTED: "Item crafted",
+    EventType.BUILDING_ENTERED: "Player entered building",
+    EventType.FLOOR_CLEARED: "Building floor cleared",
+    EventType.VEHICLE_CREATED: "Vehicle created",
+    EventType.VEHICLE_MOVED: "Vehicle moved",
+    EventType.RADIO_MESSAGE: "Radio message sent",
+    EventType.SPOTTER_USED: "Spotter device used",
+    EventType.CONSTRUCTION_STARTED: "Construction started",
+    EventType.CONSTRUCTION_COMPLETED: "Construction completed",
+    EventType.OFFLINE_MODE_SET: "Player set offline mode",
+    EventType.AMBUSH_TRIGGERED: "Ambush triggered",
+    EventType.SCAVENGE_SUCCESS: "Scavenge successful",
+    EventType.MAP_PURCHASED: "Map purchased",
+    EventType.INTEL_GATHERED: "Intelligence gathered"
+}
+
+# Per-type emission limits as (burst capacity, refill per second); lower-priority
+# events beyond the limit are dropped so a flood can't swamp the queue. The default
+# lets every player of a full game act at once and then sustain the per-player
+# command budget from the safety settings.
+EVENT_RATE_LIMITS: Dict[EventType, Tuple[float, float]] = {}
+DEFAULT_EVENT_RATE_LIMIT = (
+    MAX_PLAYERS_PER_GAME,
+    MAX_PLAYERS_PER_GAME * MAX_COMMANDS_PER_WINDOW / RATE_LIMIT_WINDOW,
+)
+
+@dataclass(slots=True)
 class GameEvent:
     """Represents a game event"""
     id: str
-    type: str
+    type: EventType
     timestamp: int
     data: Dict[str, Any]
     priority: int = 1  # 1 = low, 2 = medium, 3 = high
@@ -25,77 +89,119 @@ class EventSystem:
     """Manages game events and notifications"""
     
     def __init__(self):
-        self.event_handlers: Dict[str, List[Callable]] = {}
-        self.event_queue: List[GameEvent] = []
-        self.event_history: List[GameEvent] = []
+        # Handlers per event type as an insertion-ordered set (values unused)
+        self.event_handlers: Dict[EventType, Dict[Callable, None]] = {}
+        # Frozen copies of event_handlers for dispatch, rebuilt on (un)registration
+        self._handler_tuples: Dict[EventType, Tuple[Callable, ...]] = {}
         self.max_history = 1000
+        # Min-heap of (-priority, seq, event): highest priority first, FIFO within a priority
+        self.event_queue: List[Tuple[int, int, GameEvent]] = []
+        # Bounded: appending past max_history drops the oldest event
+        self.event_history: Deque[GameEvent] = deque(maxlen=self.max_history)
+        # The same history indexed by type and by priority, oldest first
+        self._by_type: Dict[EventType, Deque[GameEvent]] = defaultdict(deque)
+        self._by_priority: Dict[int, Deque[GameEvent]] = defaultdict(deque)
+        # Sequence numbers for event ids, unique within the process
+        self._id_gen = count()
+        # event type -> (tokens, last refill timestamp)
+        self._buckets: Dict[EventType, Tuple[float, int]] = {}
     
-    def register_handler(self, event_type: str, handler: Callable):
+    def register_handler(self, event_type: EventType, handler: Callable):
         """Register an event handler"""
-        if event_type not in self.event_handlers:
-            self.event_handlers[event_type] = []
-        
-        self.event_handlers[event_type].append(handler)
-        logger.info(f"Registered handler for event type: {event_type}")
+        handlers = self.event_handlers.setdefault(event_type, {})
+        handlers[handler] = None
+        self._handler_tuples[event_type] = tuple(handlers)
+        logger.info(f"Registered handler for event type: {event_type.name}")
     
-    def unregister_handler(self, event_type: str, handler: Callable):
+    def unregister_handler(self, event_type: EventType, handler: Callable):
         """Unregister an event handler"""
-        if event_type in self.event_handlers:
-            if handler in self.event_handlers[event_type]:
-                self.event_handlers[event_type].remove(handler)
-                logger.info(f"Unregistered handler for event type: {event_type}")
+        handlers = self.event_handlers.get(event_type)
+        if handlers is not None:
+            if handler in handlers:
+                del handlers[handler]
+                self._handler_tuples[event_type] = tuple(handlers)
+                logger.info(f"Unregistered handler for event type: {event_type.name}")
     
-    def emit_event(self, event_type: str, data: Dict[str, Any], priority: int = 1):
+    def emit_event(self, event_type: EventType, data: Dict[str, Any], priority: int = 1):
         """Emit a game event"""
+        now = get_current_timestamp()
+        if priority < PRIORITY_HIGH and not self._allow(event_type, now):
+            logger.debug(f"Dropped event over rate limit: {event_type.name}")
+            return
+        
+        seq = next(self._id_gen)
         event = GameEvent(
-            id=f"event_{get_current_timestamp()}_{len(self.event_queue)}",
+            id=f"event_{seq:x}",
             type=event_type,
-            timestamp=get_current_timestamp(),
+            timestamp=now,
             data=data,
             priority=priority
         )
         
-        self.event_queue.append(event)
-        self.event_history.append(event)
+        heapq.heappush(self.event_queue, (-priority, seq, event))
         
-        # Trim history if too long
-        if len(self.event_history) > self.max_history:
-            self.event_history = self.event_history[-self.max_history:]
+        if len(self.event_history) == self.event_history.maxlen:
+            # the evicted event is the oldest of its type and priority as well
+            evicted = self.event_history[0]
+            self._by_type[evicted.type].popleft()
+            self._by_priority[evicted.priority].popleft()
+        self.event_history.append(event)
+        self._by_type[event_type].append(event)
+        self._by_priority[priority].append(event)
         
-        logger.debug(f"Emitted event: {event_type}")
+        logger.debug(f"Emitted event: {event_type.name}")
+    
+    def _allow(self, event_type: EventType, now: int) -> bool:
+        """Take a token from the event type's bucket, refilled for the time since last use"""
+        capacity, rate = EVENT_RATE_LIMITS.get(event_type, DEFAULT_EVENT_RATE_LIMIT)
+        tokens, last_refill = self._buckets.get(event_type, (capacity, now))
+        tokens = min(capacity, tokens + (now - last_refill) * rate)
+        if tokens < 1:
+            self._buckets[event_type] = (tokens, now)
+            return False
+        self._buckets[event_type] = (tokens - 1, now)
+        return True
     
     async def process_events(self):
-        """Process all queued events"""
-        while self.event_queue:
-            event = self.event_queue.pop(0)
-            await self._handle_event(event)
+        """Process all queued events, highest priority first"""
+        # Events emitted by handlers join the heap and are ordered with the rest
+        queue = self.event_queue
+        handle_event = self._handle_event
+        while queue:
+            _, _, event = heapq.heappop(queue)
+            await handle_event(event)
     
     async def _handle_event(self, event: GameEvent):
         """Handle a single event"""
         event_type = event.type
+        handlers = self._handler_tuples.get(event_type)
         
-        if event_type in self.event_handlers:
-            for handler in self.event_handlers[event_type]:
-                try:
-                    await handler(event)
-                except Exception as e:
-                    logger.error(f"Error in event handler for {event_type}: {e}")
+        if handlers:
+            # Handlers are independent, so they run concurrently; one failing doesn't stop the rest
+            results = await asyncio.gather(
+                *(handler(event) for handler in handlers),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error in event handler for {event_type.name}: {result}")
         else:
-            logger.debug(f"No handlers for event type: {event_type}")
+            logger.debug(f"No handlers for event type: {event_type.name}")
     
-    def get_events_by_type(self, event_type: str, limit: int = 100) -> List[GameEvent]:
+    def get_events_by_type(self, event_type: EventType, limit: int = 100) -> List[GameEvent]:
         """Get recent events of a specific type"""
-        events = [e for e in self.event_history if e.type == event_type]
-        return events[-limit:] if events else []
+        events = self._by_type.get(event_type)
+        return list(islice(events, max(0, len(events) - limit), None)) if events else []
     
     def get_events_by_priority(self, priority: int, limit: int = 100) -> List[GameEvent]:
         """Get recent events of a specific priority"""
-        events = [e for e in self.event_history if e.priority == priority]
-        return events[-limit:] if events else []
+        events = self._by_priority.get(priority)
+        return list(islice(events, max(0, len(events) - limit), None)) if events else []
     
     def get_recent_events(self, limit: int = 100) -> List[GameEvent]:
         """Get recent events"""
-        return self.event_history[-limit:] if self.event_history else []
+        history = self.event_history
+        return list(islice(history, max(0, len(history) - limit), None)) if history else []
     
     def clear_event_queue(self):
         """Clear the event queue"""
@@ -103,9 +209,8 @@ class EventSystem:
     
     def get_event_stats(self) -> Dict[str, Any]:
         """Get event system statistics"""
-        event_counts = {}
-        for event in self.event_history:
-            event_counts[event.type] = event_counts.get(event.type, 0) + 1
+        # the per-type index already holds exactly the history's events of each type
+        event_counts = {event_type.name.lower(): len(events) for event_type, events in self._by_type.items() if events}
         
         return {
             "total_events": len(self.event_history),
@@ -117,31 +222,6 @@ class EventSystem:
 # Global event system instance
 event_system = EventSystem()
 
-# Common event types
-EVENT_TYPES = {
-    "player_created": "Player character created",
-    "player_died": "Player died",
-    "player_moved": "Player moved to new location",
-    "combat_started": "Combat initiated",
-    "combat_ended": "Combat finished",
-    "zombie_spawned": "Zombie spawned",
-    "zombie_killed": "Zombie killed",
-    "item_crafted": "Item crafted",
-    "building_entered": "Player entered building",
-    "floor_cleared": "Building floor cleared",
-    "vehicle_created": "Vehicle created",
-    "vehicle_moved": "Vehicle moved",
-    "radio_message": "Radio message sent",
-    "spotter_used": "Spotter device used",
-    "construction_started": "Construction started",
-    "construction_completed": "Construction completed",
-    "offline_mode_set": "Player set offline mode",
-    "ambush_triggered": "Ambush triggered",
-    "scavenge_success": "Scavenge successful",
-    "map_purchased": "Map purchased",
-    "intel_gathered": "Intelligence gathered"
-}
-
 # Event priorities
 PRIORITY_LOW = 1
 PRIORITY_MEDIUM = 2
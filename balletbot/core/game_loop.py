@@ -3,32 +3,129 @@ Game loop for BalletBot: Outbreak Dominion
 Handles message processing and command routing
 """
 
+import asyncio
+import functools
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from utils.file_manager import file_manager
-from utils.helpers import get_current_timestamp, add_action_to_history
+from utils.helpers import get_current_timestamp, add_action_to_history, canonical_class
+from utils.db import log_events
+from systems.player_system import player_system
+from systems.building_system import building_system
+from systems.crafting_system import crafting_system
+from systems.offline_system import offline_system
+from systems.radio_system import radio_system
+from systems.spotter_system import spotter_system
 
 logger = logging.getLogger(__name__)
 
+# Admin checks are remembered briefly so a burst of admin commands costs one lookup
+ADMIN_CHECK_TTL = 30.0
+ADMIN_CHECK_CACHE_SIZE = 256
+
+# Command handlers allowed to run at once; the rest wait their turn
+MAX_CONCURRENT_HANDLERS = 64
+
+# Fixed reply text, built once
+ERROR_PREFIX = "❌ "
+ERROR_REPLY = "❌ An error occurred."
+
+PRIVATE_CHAT = "private"
+PRIVATE_ONLY_MSG = "❌ This command must be used in private messages."
+
+class CommandContext:
+    """One command invocation, with the chat and user ids converted once at dispatch"""
+    __slots__ = ("message", "command", "args", "chat_id", "user_id")
+    
+    def __init__(self, message, command: str, args: str):
+        self.message = message
+        self.command = command
+        self.args = args
+        self.chat_id = str(message.chat.id)
+        self.user_id = str(message.from_user.id)
+
+def private_only(func: Callable) -> Callable:
+    """Decorator for command handlers that only work in a private chat with the bot"""
+    @functools.wraps(func)
+    async def wrapper(self, ctx: CommandContext):
+        if ctx.message.chat.type != PRIVATE_CHAT:
+            await self.bot.send_message(ctx.chat_id, PRIVATE_ONLY_MSG)
+            return
+        return await func(self, ctx)
+    return wrapper
+
+# Replies for commands whose game systems don't exist yet
+STUB_REPLIES = {
+    "map": "🗺️ Map functionality coming soon!",
+    "loot": "💎 Looting functionality coming soon!",
+    "build": "🏗️ Building functionality coming soon!",
+    "seek": "🔍 Seek functionality coming soon!",
+    "mine": "⛏️ Mining functionality coming soon!",
+    "chop": "🪓 Chopping functionality coming soon!",
+    "vehicle": "🚗 Vehicle functionality coming soon!",
+}
+
 class GameLoop:
     """Main game loop for processing messages and commands"""
     
-    def __init__(self, bot, world_manager, scheduler):
+    def __init__(self, bot, world_manager, scheduler,
+                 max_concurrent_handlers: int = MAX_CONCURRENT_HANDLERS):
         self.bot = bot
         self.world_manager = world_manager
         self.scheduler = scheduler
         self.running = False
+        self._handler_sem = asyncio.Semaphore(max_concurrent_handlers)
+        self._poll_task: Optional[asyncio.Task] = None
+        # Game events waiting to be written to the database by the log writer task
+        self._log_queue: Optional[asyncio.Queue] = None
+        self._log_task: Optional[asyncio.Task] = None
+        # Command name (without the slash) -> handler, registered in one pass
+        self._commands: Dict[str, Callable] = {
+            # Admin commands
+            "start_season": self._handle_start_season,
+            "announce": self._handle_announce,
+            "pause_world": self._handle_pause_world,
+            "resume_world": self._handle_resume_world,
+            "reset_world": self._handle_reset_world,
+            
+            # Player commands
+            "join": self._handle_join,
+            "create_character": self._handle_create_character,
+            "status": self._handle_status,
+            "move": self._handle_move,
+            "enter": self._handle_enter,
+            "floor": self._handle_floor,
+            "sneak": self._handle_sneak,
+            "attack": self._handle_attack,
+            "craft": self._handle_craft,
+            "setmode": self._handle_setmode,
+            "radio": self._handle_radio,
+            "setfreq": self._handle_setfreq,
+            "intel": self._handle_intel,
+        }
+        for name, reply in STUB_REPLIES.items():
+            self._commands[name] = self._make_stub(name, reply)
+        # (chat_id, user_id) -> (is_admin, expiry on the monotonic clock), least recently used first
+        self._admin_cache: "OrderedDict[Tuple[str, str], Tuple[bool, float]]" = OrderedDict()
+        # Admin checks in progress, so concurrent checks for the same key share one lookup
+        self._admin_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
     
     async def start(self):
         """Start the game loop"""
         try:
             self.running = True
             
+            self._log_queue = asyncio.Queue()
+            self._log_task = asyncio.create_task(self._log_writer(), name="event-log")
+            
             # Register command handlers
             self._register_commands()
             
-            # Start bot polling
-            await self.bot.start_polling()
+            # Poll in the background; start_polling only returns once polling stops
+            self._poll_task = asyncio.create_task(self.bot.start_polling(), name="bale-poll")
+            self._poll_task.add_done_callback(self._on_poll_done)
             
             logger.info("Game loop started")
             
@@ -41,107 +138,181 @@ class GameLoop:
         try:
             self.running = False
             await self.bot.stop_polling()
+            task, self._poll_task = self._poll_task, None
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            
+            # Flush logged events
+            task, self._log_task = self._log_task, None
+            if task is not None:
+                self._log_queue.put_nowait(None)
+                await task
             logger.info("Game loop stopped")
             
         except Exception as e:
             logger.error(f"Error stopping game loop: {e}")
     
+    def _log_event(self, event_type: str, payload: Dict[str, Any]):
+        """Queue a game event for the database without blocking the handler"""
+        if self._log_queue is not None:
+            self._log_queue.put_nowait((get_current_timestamp(), event_type, payload))
+    
+    async def _log_writer(self):
+        """Write queued events to the database in batches, off the event loop"""
+        queue = self._log_queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                await asyncio.to_thread(log_events, batch)
+            except Exception as e:
+                logger.error(f"Error writing {len(batch)} events to the database: {e}")
+    
+    def _on_poll_done(self, task: asyncio.Task):
+        """Report polling that ended on its own with an error"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Polling stopped with an error: {task.exception()}")
+    
     def _register_commands(self):
         """Register all command handlers"""
         try:
-            # Admin commands
-            self.bot.command("/start_season")(self._handle_start_season)
-            self.bot.command("/announce")(self._handle_announce)
-            self.bot.command("/pause_world")(self._handle_pause_world)
-            self.bot.command("/resume_world")(self._handle_resume_world)
-            self.bot.command("/reset_world")(self._handle_reset_world)
-            
-            # Player commands
-            self.bot.command("/join")(self._handle_join)
-            self.bot.command("/create_character")(self._handle_create_character)
-            self.bot.command("/status")(self._handle_status)
-            self.bot.command("/map")(self._handle_map)
-            self.bot.command("/move")(self._handle_move)
-            self.bot.command("/loot")(self._handle_loot)
-            self.bot.command("/enter")(self._handle_enter)
-            self.bot.command("/floor")(self._handle_floor)
-            self.bot.command("/sneak")(self._handle_sneak)
-            self.bot.command("/attack")(self._handle_attack)
-            self.bot.command("/craft")(self._handle_craft)
-            self.bot.command("/build")(self._handle_build)
-            self.bot.command("/setmode")(self._handle_setmode)
-            self.bot.command("/seek")(self._handle_seek)
-            self.bot.command("/radio")(self._handle_radio)
-            self.bot.command("/setfreq")(self._handle_setfreq)
-            self.bot.command("/intel")(self._handle_intel)
-            self.bot.command("/mine")(self._handle_mine)
-            self.bot.command("/chop")(self._handle_chop)
-            self.bot.command("/vehicle")(self._handle_vehicle)
+            for name, handler in self._commands.items():
+                self.bot.command(f"/{name}")(self._dispatcher(name, handler))
             
             logger.info("Command handlers registered")
             
         except Exception as e:
             logger.error(f"Error registering commands: {e}")
     
+    def resolve(self, name: str) -> Optional[Callable]:
+        """Handler for a command name without the slash, or None if unknown"""
+        return self._commands.get(name)
+    
+    def _dispatcher(self, name: str, handler: Callable) -> Callable:
+        """Adapt a handler to the bot's (message, args) call, run under the handler semaphore"""
+        semaphore = self._handler_sem
+        
+        @functools.wraps(handler)
+        async def guarded(message, args):
+            async with semaphore:
+                return await handler(CommandContext(message, name, args))
+        return guarded
+    
+    def _make_stub(self, name: str, reply: str) -> Callable:
+        """Build the handler for a command that only answers with a fixed reply"""
+        @private_only
+        async def handler(game_loop: "GameLoop", ctx: CommandContext):
+            try:
+                await game_loop.bot.send_message(ctx.chat_id, reply)
+            except Exception as e:
+                logger.error(f"Error handling {name}: {e}")
+        return functools.partial(handler, self)
+    
+    async def _is_admin(self, chat_id: str, user_id: str) -> bool:
+        """Check admin status through the bot, cached for ADMIN_CHECK_TTL seconds"""
+        key = (chat_id, user_id)
+        now = time.monotonic()
+        cached = self._admin_cache.get(key)
+        if cached is not None and now < cached[1]:
+            self._admin_cache.move_to_end(key)
+            return cached[0]
+        
+        inflight = self._admin_inflight.get(key)
+        if inflight is not None:
+            return await inflight
+        
+        future = asyncio.get_running_loop().create_future()
+        self._admin_inflight[key] = future
+        try:
+            is_admin = await self.bot.is_admin(chat_id, user_id)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # the caller re-raises it; don't warn if nobody else was waiting
+            raise
+        else:
+            future.set_result(is_admin)
+        finally:
+            del self._admin_inflight[key]
+            if not future.done():
+                future.cancel()
+        
+        self._admin_cache[key] = (is_admin, now + ADMIN_CHECK_TTL)
+        self._admin_cache.move_to_end(key)
+        if len(self._admin_cache) > ADMIN_CHECK_CACHE_SIZE:
+            self._admin_cache.popitem(last=False)
+        return is_admin
+    
     # Admin command handlers
-    async def _handle_start_season(self, message, args):
+    async def _handle_start_season(self, ctx: CommandContext):
         """Handle /start_season command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
             # Check if user is admin
-            if not await self.bot.is_admin(chat_id, user_id):
+            if not await self._is_admin(chat_id, user_id):
                 await self.bot.send_message(chat_id, "❌ You must be an admin to start a season.")
                 return
             
             # Create new game
-            from systems.player_system import player_system
             game_code = player_system.create_game()
             
             if game_code:
+                self._log_event("season_started", {"game_code": game_code, "admin_id": user_id})
                 await self.bot.send_message(chat_id, f"✅ Season started! Game code: **{game_code}**")
-                logger.info(f"Admin {user_id} started season {game_code}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Admin {user_id} started season {game_code}")
             else:
                 await self.bot.send_message(chat_id, "❌ Failed to start season.")
                 
         except Exception as e:
             logger.error(f"Error handling start_season: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_announce(self, message, args):
+    async def _handle_announce(self, ctx: CommandContext):
         """Handle /announce command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
             # Check if user is admin
-            if not await self.bot.is_admin(chat_id, user_id):
+            if not await self._is_admin(chat_id, user_id):
                 await self.bot.send_message(chat_id, "❌ You must be an admin to make announcements.")
                 return
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide a message to announce.")
                 return
             
             # Send announcement
-            announcement = f"📢 **ANNOUNCEMENT**\n\n{args}"
+            announcement = f"📢 **ANNOUNCEMENT**\n\n{ctx.args}"
             await self.bot.send_message(chat_id, announcement)
             
-            logger.info(f"Admin {user_id} made announcement: {args[:100]}...")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Admin {user_id} made announcement: {ctx.args[:100]}...")
             
         except Exception as e:
             logger.error(f"Error handling announce: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_pause_world(self, message, args):
+    async def _handle_pause_world(self, ctx: CommandContext):
         """Handle /pause_world command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
             # Check if user is admin
-            if not await self.bot.is_admin(chat_id, user_id):
+            if not await self._is_admin(chat_id, user_id):
                 await self.bot.send_message(chat_id, "❌ You must be an admin to pause the world.")
                 return
             
@@ -150,16 +321,16 @@ class GameLoop:
             
         except Exception as e:
             logger.error(f"Error handling pause_world: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_resume_world(self, message, args):
+    async def _handle_resume_world(self, ctx: CommandContext):
         """Handle /resume_world command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
             # Check if user is admin
-            if not await self.bot.is_admin(chat_id, user_id):
+            if not await self._is_admin(chat_id, user_id):
                 await self.bot.send_message(chat_id, "❌ You must be an admin to resume the world.")
                 return
             
@@ -168,16 +339,16 @@ class GameLoop:
             
         except Exception as e:
             logger.error(f"Error handling resume_world: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_reset_world(self, message, args):
+    async def _handle_reset_world(self, ctx: CommandContext):
         """Handle /reset_world command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
             # Check if user is admin
-            if not await self.bot.is_admin(chat_id, user_id):
+            if not await self._is_admin(chat_id, user_id):
                 await self.bot.send_message(chat_id, "❌ You must be an admin to reset the world.")
                 return
             
@@ -186,23 +357,23 @@ class GameLoop:
             
         except Exception as e:
             logger.error(f"Error handling reset_world: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
     # Player command handlers
-    async def _handle_join(self, message, args):
+    @private_only
+    async def _handle_join(self, ctx: CommandContext):
         """Handle /join command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide a game code. Usage: `/join <game_code>`")
                 return
             
-            game_code = args.strip()
+            game_code = ctx.args.strip()
             
             # Join game
-            from systems.player_system import player_system
             if player_system.join_game(user_id, game_code):
                 await self.bot.send_message(chat_id, f"✅ Joined game {game_code}! Use `/create_character <name> <class>` to create your character.")
             else:
@@ -210,46 +381,47 @@ class GameLoop:
             
         except Exception as e:
             logger.error(f"Error handling join: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_create_character(self, message, args):
+    @private_only
+    async def _handle_create_character(self, ctx: CommandContext):
         """Handle /create_character command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide name and class. Usage: `/create_character <name> <class>`")
                 return
             
-            parts = args.split()
+            parts = ctx.args.split(None, 2)
             if len(parts) < 2:
                 await self.bot.send_message(chat_id, "❌ Please provide both name and class. Usage: `/create_character <name> <class>`")
                 return
             
             name = parts[0]
-            char_class = parts[1]
+            # unknown classes go through as typed so player_system reports them
+            char_class = canonical_class(parts[1]) or parts[1]
             
             # Create character
-            from systems.player_system import player_system
             result = player_system.create_character(user_id, name, char_class, "DEFAULT_GAME")
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling create_character: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_status(self, message, args):
+    @private_only
+    async def _handle_status(self, ctx: CommandContext):
         """Handle /status command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            from systems.player_system import player_system
             status = player_system.get_player_status(user_id)
             
             if status:
@@ -259,34 +431,21 @@ class GameLoop:
             
         except Exception as e:
             logger.error(f"Error handling status: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
-    
-    async def _handle_map(self, message, args):
-        """Handle /map command"""
-        try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
-            
-            # TODO: Implement map functionality
-            await self.bot.send_message(chat_id, "🗺️ Map functionality coming soon!")
-            
-        except Exception as e:
-            logger.error(f"Error handling map: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_move(self, message, args):
+    @private_only
+    async def _handle_move(self, ctx: CommandContext):
         """Handle /move command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide a location. Usage: `/move <location>`")
                 return
             
-            location = args.strip()
+            location = ctx.args.strip()
             
-            from systems.player_system import player_system
             if player_system.move_player(user_id, location):
                 await self.bot.send_message(chat_id, f"✅ Moved to {location}")
             else:
@@ -294,56 +453,44 @@ class GameLoop:
             
         except Exception as e:
             logger.error(f"Error handling move: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_loot(self, message, args):
-        """Handle /loot command"""
-        try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
-            
-            # TODO: Implement looting functionality
-            await self.bot.send_message(chat_id, "💎 Looting functionality coming soon!")
-            
-        except Exception as e:
-            logger.error(f"Error handling loot: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
-    
-    async def _handle_enter(self, message, args):
+    @private_only
+    async def _handle_enter(self, ctx: CommandContext):
         """Handle /enter command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide a building name. Usage: `/enter <building>`")
                 return
             
-            building_name = args.strip()
+            building_name = ctx.args.strip()
             
-            from systems.building_system import building_system
             result = building_system.enter_building(user_id, building_name)
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling enter: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_floor(self, message, args):
+    @private_only
+    async def _handle_floor(self, ctx: CommandContext):
         """Handle /floor command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide floor number and action. Usage: `/floor <number> <action>`")
                 return
             
-            parts = args.split()
+            parts = ctx.args.split(None, 2)
             if len(parts) < 2:
                 await self.bot.send_message(chat_id, "❌ Please provide both floor number and action. Usage: `/floor <number> <action>`")
                 return
@@ -355,203 +502,172 @@ class GameLoop:
                 await self.bot.send_message(chat_id, "❌ Floor number must be a number.")
                 return
             
-            from systems.building_system import building_system
             result = building_system.enter_floor(user_id, floor_number, action)
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling floor: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_sneak(self, message, args):
+    @private_only
+    async def _handle_sneak(self, ctx: CommandContext):
         """Handle /sneak command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            from systems.building_system import building_system
             result = building_system.process_encounter_action(user_id, "sneak")
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling sneak: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_attack(self, message, args):
+    @private_only
+    async def _handle_attack(self, ctx: CommandContext):
         """Handle /attack command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            from systems.building_system import building_system
             result = building_system.process_encounter_action(user_id, "attack")
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling attack: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_craft(self, message, args):
+    @private_only
+    async def _handle_craft(self, ctx: CommandContext):
         """Handle /craft command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide an item to craft. Usage: `/craft <item>`")
                 return
             
-            item_id = args.strip()
+            item_id = ctx.args.strip()
             
-            from systems.crafting_system import crafting_system
             result = crafting_system.craft_item(user_id, item_id)
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling craft: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_build(self, message, args):
-        """Handle /build command"""
-        try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
-            
-            # TODO: Implement building functionality
-            await self.bot.send_message(chat_id, "🏗️ Building functionality coming soon!")
-            
-        except Exception as e:
-            logger.error(f"Error handling build: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
-    
-    async def _handle_setmode(self, message, args):
+    @private_only
+    async def _handle_setmode(self, ctx: CommandContext):
         """Handle /setmode command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide a mode. Usage: `/setmode <mode>`")
                 return
             
-            mode = args.strip()
+            mode = ctx.args.strip()
             
-            from systems.offline_system import offline_system
             result = offline_system.set_offline_mode(user_id, mode)
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling setmode: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
-    
-    async def _handle_seek(self, message, args):
-        """Handle /seek command"""
-        try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
-            
-            # TODO: Implement seek functionality
-            await self.bot.send_message(chat_id, "🔍 Seek functionality coming soon!")
-            
-        except Exception as e:
-            logger.error(f"Error handling seek: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_radio(self, message, args):
+    @private_only
+    async def _handle_radio(self, ctx: CommandContext):
         """Handle /radio command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide frequency and message. Usage: `/radio <freq> <message>`")
                 return
             
-            parts = args.split(' ', 1)
-            if len(parts) < 2:
+            frequency, sep, message_text = ctx.args.partition(' ')
+            if not sep:
                 await self.bot.send_message(chat_id, "❌ Please provide both frequency and message. Usage: `/radio <freq> <message>`")
                 return
             
-            frequency = parts[0]
-            message_text = parts[1]
-            
-            from systems.radio_system import radio_system
             result = radio_system.send_radio_message(user_id, frequency, message_text)
             
             if result["success"]:
                 await self.bot.send_message(chat_id, f"✅ Radio message sent to {result['listeners']} listeners")
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling radio: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_setfreq(self, message, args):
+    @private_only
+    async def _handle_setfreq(self, ctx: CommandContext):
         """Handle /setfreq command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide a frequency. Usage: `/setfreq <frequency>`")
                 return
             
-            frequency = args.strip()
+            frequency = ctx.args.strip()
             
-            from systems.radio_system import radio_system
             result = radio_system.set_frequency(user_id, frequency)
             
             if result["success"]:
                 await self.bot.send_message(chat_id, result["message"])
             else:
-                await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
         except Exception as e:
             logger.error(f"Error handling setfreq: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
     
-    async def _handle_intel(self, message, args):
+    @private_only
+    async def _handle_intel(self, ctx: CommandContext):
         """Handle /intel command"""
         try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
+            chat_id = ctx.chat_id
+            user_id = ctx.user_id
             
-            if not args:
+            if not ctx.args:
                 await self.bot.send_message(chat_id, "❌ Please provide an action. Usage: `/intel <action>`")
                 return
             
-            parts = args.split()
+            parts = ctx.args.split(None, 2)
             action = parts[0]
             
-            from systems.spotter_system import spotter_system
-            
             if action == "buy_spotter":
                 result = spotter_system.buy_spotter(user_id)
                 if result["success"]:
                     await self.bot.send_message(chat_id, result["message"])
                 else:
-                    await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                    await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
             elif action == "use_spotter":
                 if len(parts) < 2:
@@ -564,50 +680,11 @@ class GameLoop:
                 if result["success"]:
                     await self.bot.send_message(chat_id, result["report"])
                 else:
-                    await self.bot.send_message(chat_id, f"❌ {result['error']}")
+                    await self.bot.send_message(chat_id, ERROR_PREFIX + result['error'])
             
             else:
                 await self.bot.send_message(chat_id, "❌ Invalid action. Use `buy_spotter` or `use_spotter <target>`")
             
         except Exception as e:
             logger.error(f"Error handling intel: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
-    
-    async def _handle_mine(self, message, args):
-        """Handle /mine command"""
-        try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
-            
-            # TODO: Implement mining functionality
-            await self.bot.send_message(chat_id, "⛏️ Mining functionality coming soon!")
-            
-        except Exception as e:
-            logger.error(f"Error handling mine: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
-    
-    async def _handle_chop(self, message, args):
-        """Handle /chop command"""
-        try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
-            
-            # TODO: Implement chopping functionality
-            await self.bot.send_message(chat_id, "🪓 Chopping functionality coming soon!")
-            
-        except Exception as e:
-            logger.error(f"Error handling chop: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
-    
-    async def _handle_vehicle(self, message, args):
-        """Handle /vehicle command"""
-        try:
-            chat_id = str(message.chat.id)
-            user_id = str(message.from_user.id)
-            
-            # TODO: Implement vehicle functionality
-            await self.bot.send_message(chat_id, "🚗 Vehicle functionality coming soon!")
-            
-        except Exception as e:
-            logger.error(f"Error handling vehicle: {e}")
-            await self.bot.send_message(str(message.chat.id), "❌ An error occurred.")
\ No newline at end of file
+            await self.bot.send_message(ctx.chat_id, ERROR_REPLY)
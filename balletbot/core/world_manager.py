@@ -7,7 +7,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from utils.file_manager import file_manager
 from utils.helpers import get_current_timestamp
-from config import WORLD_REGIONS, BUILDING_FLOORS
+from config import WORLD_REGIONS, BUILDING_FLOORS, thaw
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +41,10 @@ class WorldManager:
     async def _create_default_regions(self):
         """Create default world regions"""
         try:
-            for region_name, region_data in WORLD_REGIONS.items():
+            for region_name, default_region in WORLD_REGIONS.items():
+                # Regions change during play, so each starts as a mutable copy
+                region_data = thaw(default_region)
+                
                 # Add timestamp
                 region_data["last_updated"] = get_current_timestamp()
                 
@@ -12,12 +12,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
-from config import USE_REAL_BALE_API
-
-if USE_REAL_BALE_API:
-    from bale_api_real import BaleAPI
-else:
-    from bale_api_simple import BaleAPI
+from bale_api_base import make_bale_api
 from core.game_loop import GameLoop
 from core.world_manager import WorldManager
 from core.scheduler import Scheduler
@@ -32,7 +27,7 @@ class BalletBot:
     """Main bot class that orchestrates all game systems"""
     
     def __init__(self):
-        self.bot = BaleAPI(BOT_TOKEN)
+        self.bot = make_bale_api(BOT_TOKEN)
         self.world_manager = WorldManager()
         self.scheduler = Scheduler(self.world_manager)
         self.game_loop = GameLoop(self.bot, self.world_manager, self.scheduler)
@@ -81,4 +76,9 @@ async def main():
         await bot.stop()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
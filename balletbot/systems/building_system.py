@@ -8,7 +8,7 @@ import random
 from typing import Dict, List, Optional, Any, Tuple
 from utils.file_manager import file_manager
 from utils.helpers import get_current_timestamp, add_action_to_history
-from config import DECISION_WINDOW, BUILDING_FLOORS
+from config import DECISION_WINDOW, BUILDING_FLOORS, thaw
 
 logger = logging.getLogger(__name__)
 
@@ -395,7 +395,7 @@ class BuildingSystem:
             region = location.split(":")[0] if ":" in location else location
             
             # Get floor data from config
-            floors = BUILDING_FLOORS.get(building_name, [])
+            floors = thaw(BUILDING_FLOORS.get(building_name, ()))
             
             return {
                 "id": building_id,
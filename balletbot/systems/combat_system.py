@@ -8,7 +8,7 @@ import random
 from typing import Dict, List, Optional, Any, Tuple
 from utils.file_manager import file_manager
 from utils.helpers import get_current_timestamp, calculate_damage, add_action_to_history
-from config import COMBAT_CRITICAL_HIT_CHANCE, COMBAT_ALERTED_BONUS, COMBAT_AMBUSH_BONUS
+from config import COMBAT_CRITICAL_HIT_CHANCE, COMBAT_ALERTED_BONUS, COMBAT_AMBUSH_BONUS, BONUS_WEAPON_DAMAGE
 
 logger = logging.getLogger(__name__)
 
@@ -125,17 +125,14 @@ class CombatSystem:
             
             # Calculate damage
             weapon_damage = 10  # Default melee damage
-            class_bonus = 0.0
             
             if combat["turn"] == "attacker" and combat["attacker_weapon"]:
                 weapon_damage = combat["attacker_weapon"].get("damage", 10)
             elif combat["turn"] == "target" and combat["target_weapon"]:
                 weapon_damage = combat["target_weapon"].get("damage", 10)
             
-            # Apply class bonus
-            char_class = attacker.get("class", "")
-            if char_class == "Soldier":
-                class_bonus = 0.10  # +10% weapon damage
+            # Apply class bonus (Soldier: +10% weapon damage)
+            class_bonus = BONUS_WEAPON_DAMAGE.get(attacker.get("class", ""), 0.0)
             
             # Check for critical hit
             critical_hit = self._roll_critical_hit()
@@ -8,6 +8,7 @@ import json
 from typing import Dict, List, Optional, Any, Tuple
 from utils.file_manager import file_manager
 from utils.helpers import get_current_timestamp, add_action_to_history
+from config import RECIPES_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ class CraftingSystem:
     def _load_recipes(self):
         """Load recipes from JSON file"""
         try:
-            with open("data/recipes.json", "r", encoding="utf-8") as f:
+            with open(RECIPES_PATH, "r", encoding="utf-8") as f:
                 self.recipes = json.load(f)
             logger.info(f"Loaded {len(self.recipes)} recipes")
         except Exception as e:
@@ -197,7 +198,7 @@ class CraftingSystem:
     def _save_recipes(self):
         """Save recipes to file"""
         try:
-            with open("data/recipes.json", "w", encoding="utf-8") as f:
+            with open(RECIPES_PATH, "w", encoding="utf-8") as f:
                 json.dump(self.recipes, f, indent=2, ensure_ascii=False)
         except Exception as e:
             logger.error(f"Error saving recipes: {e}")
@@ -8,6 +8,7 @@ import json
 from typing import Dict, List, Optional, Any, Tuple
 from utils.file_manager import file_manager
 from utils.helpers import get_current_timestamp
+from config import ITEMS_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ class InventorySystem:
     def _load_item_definitions(self):
         """Load item definitions from JSON file"""
         try:
-            with open("data/items.json", "r", encoding="utf-8") as f:
+            with open(ITEMS_PATH, "r", encoding="utf-8") as f:
                 self.item_definitions = json.load(f)
             logger.info(f"Loaded {len(self.item_definitions)} item definitions")
         except Exception as e:
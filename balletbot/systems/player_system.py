@@ -7,7 +7,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from utils.file_manager import file_manager
 from utils.helpers import get_current_timestamp, generate_game_code, is_valid_username, is_valid_class
-from config import CLASS_BONUSES, DEFAULT_HP, DEFAULT_STAMINA, DEFAULT_HUNGER, DEFAULT_INFECTION, DEFAULT_INTELLIGENCE, DEFAULT_LOCATION
+from config import CLASS_BONUSES, SCALED_ACTION_COOLDOWNS, DEFAULT_HP, DEFAULT_STAMINA, DEFAULT_HUNGER, DEFAULT_INFECTION, DEFAULT_INTELLIGENCE, DEFAULT_LOCATION
 
 logger = logging.getLogger(__name__)
 
@@ -288,12 +288,10 @@ class PlayerSystem:
     def check_cooldown(self, user_id: str, action: str) -> bool:
         """Check if player can perform action (cooldown)"""
         try:
-            from config import ACTION_COOLDOWNS
-            
             if user_id not in self.player_cooldowns:
                 self.player_cooldowns[user_id] = {}
             
-            cooldown_duration = ACTION_COOLDOWNS.get(action, 0)
+            cooldown_duration = SCALED_ACTION_COOLDOWNS.get(action, 0)
             if cooldown_duration == 0:
                 return True
             
@@ -8,7 +8,7 @@ import random
 from typing import Dict, List, Optional, Any, Tuple
 from utils.file_manager import file_manager
 from utils.helpers import get_current_timestamp, add_action_to_history
-from config import VEHICLE_TYPES, VEHICLE_CONDITION_THRESHOLD, VEHICLE_REPAIR_RATE
+from config import VEHICLE_TYPES, VEHICLE_CONDITION_THRESHOLD, VEHICLE_REPAIR_RATE, thaw
 
 logger = logging.getLogger(__name__)
 
@@ -373,7 +373,7 @@ class VehicleSystem:
                 "fuel_capacity": type_data["fuel_capacity"],
                 "storage": type_data["storage"],
                 "speed": type_data["speed"],
-                "repair_cost": type_data.get("repair_cost", {})
+                "repair_cost": thaw(type_data.get("repair_cost", {}))
             })
         
         return vehicles
@@ -432,7 +432,7 @@ class VehicleSystem:
             
             return {
                 "success": True,
-                "repair_cost": repair_cost,
+                "repair_cost": thaw(repair_cost),
                 "current_condition": vehicle.get("condition", 0),
                 "max_condition": vehicle.get("max_condition", 100)
             }
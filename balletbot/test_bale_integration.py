@@ -5,13 +5,18 @@ Tests the balletbot with real Bale API
 """
 
 import asyncio
+import json
 import logging
 import sys
+import tempfile
 from pathlib import Path
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
+# The bale library sits next to the balletbot package
+sys.path.append(str(Path(__file__).parent.parent))
 
+from bale.bot import Bot
 from bale_api_simple import BaleAPI
 from config import BOT_TOKEN
 
@@ -103,6 +108,243 @@ async def test_balletbot_integration():
         logger.error(f"❌ Balletbot integration test failed: {e}")
         return False
 
+class _FakeResponse:
+    """aiohttp response stand-in with a fixed status and JSON body"""
+    def __init__(self, session, body, status=200):
+        self.session = session
+        self.status = status
+        self._body = body
+    
+    async def json(self):
+        self.session.decoded += 1
+        if isinstance(self._body, asyncio.Future):
+            return await self._body
+        return self._body
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+class _FakeSession:
+    """aiohttp session stand-in that records requests and answers from ``replies``
+
+    ``replies`` maps an API method name to a function taking the decoded JSON
+    body and returning the response body, or a future resolving to it.
+    """
+    def __init__(self, replies):
+        self.replies = replies
+        self.requests = []
+        self.decoded = 0
+        self.closed = False
+    
+    def request(self, method, url, data=None, **kwargs):
+        endpoint = url.rsplit("/", 1)[1]
+        body = json.loads(data) if isinstance(data, str) else None
+        self.requests.append((endpoint, body))
+        return _FakeResponse(self, self.replies[endpoint](body))
+    
+    async def close(self):
+        self.closed = True
+
+async def test_mock_stop_before_poll():
+    """Test that a stop_polling issued before the poll task runs still stops it"""
+    try:
+        logger.info("Testing mock polling stopped before it starts...")
+        
+        bot = BaleAPI(BOT_TOKEN)
+        for _ in range(2):
+            poll = asyncio.create_task(bot.start_polling())
+            await bot.stop_polling()
+            await asyncio.wait_for(poll, 1)
+            assert not bot.running
+        
+        logger.info("✅ Early stop ends mock polling, and polling can start again")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Mock early stop test failed: {e!r}")
+        return False
+
+def _stub_session(bot, replies):
+    """Put a fake session behind the bot's real HTTPClient"""
+    session = _FakeSession(replies)
+    bot.http._HTTPClient__session = session
+    return session
+
+async def test_bot_long_polling():
+    """Test that Bot.start_polling sends getUpdates params the HTTP client accepts"""
+    try:
+        logger.info("Testing bale Bot long polling...")
+        
+        bot = Bot(BOT_TOKEN, cache_dir=None)
+        received = []
+        
+        def get_updates(body):
+            if body["offset"] == 0:
+                return {"ok": True, "result": [{"update_id": 41, "message": {"text": "hi"}}]}
+            bot.running = False
+            return {"ok": True, "result": []}
+        
+        session = _stub_session(bot, {
+            "getMe": lambda body: {"ok": True, "result": {"id": 1, "first_name": "Test"}},
+            "getUpdates": get_updates
+        })
+        
+        async def update_handler(update):
+            received.append(update["update_id"])
+        
+        await asyncio.wait_for(bot.start_polling(update_handler, timeout=25), 10)
+        await bot.stop_polling()
+        
+        polls = [body for endpoint, body in session.requests if endpoint == "getUpdates"]
+        assert polls == [{"offset": 0, "timeout": 25}, {"offset": 42, "timeout": 25}], polls
+        assert received == [41], received
+        assert session.closed
+        logger.info("✅ Long polling passes offset and timeout to getUpdates")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Bot long polling test failed: {e!r}")
+        return False
+
+async def test_bot_stop_cancels_refresh():
+    """Test that stop_polling ends the background bot info refresh before closing the session"""
+    try:
+        logger.info("Testing bale Bot shutdown with a refresh in flight...")
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            bot = Bot(BOT_TOKEN, cache_dir=cache_dir)
+            with open(bot._bot_info_cache_path(), "w", encoding="utf-8") as file:
+                json.dump({"id": 1, "first_name": "Cached"}, file)
+            
+            get_me = asyncio.get_running_loop().create_future()
+            
+            def get_updates(body):
+                bot.running = False
+                return {"ok": True, "result": []}
+            
+            session = _stub_session(bot, {
+                "getMe": lambda body: get_me,
+                "getUpdates": get_updates
+            })
+            
+            await asyncio.wait_for(bot.start_polling(timeout=25), 10)
+            refresh = bot._refresh_user_task
+            assert refresh is not None and not refresh.done()
+            await bot.stop_polling()
+        
+        assert refresh.cancelled() and get_me.cancelled()
+        assert bot._refresh_user_task is None
+        assert session.closed
+        logger.info("✅ Pending bot info refresh cancelled on stop")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Bot refresh shutdown test failed: {e!r}")
+        return False
+
+async def test_bot_send_without_response():
+    """Test the wait_response=False send path and callback answers through the real HTTPClient"""
+    try:
+        logger.info("Testing bale Bot sends that skip the response body...")
+        
+        bot = Bot(BOT_TOKEN, cache_dir=None)
+        session = _stub_session(bot, {
+            "sendMessage": lambda body: {"ok": True, "result": {"message_id": 1}},
+            "answerCallbackQuery": lambda body: {"ok": True, "result": True}
+        })
+        
+        result = await bot.send_message(123, "hello", wait_response=False)
+        assert result is None, result
+        assert await bot.answer_callback_query("cb1", "done") is True
+        
+        assert session.requests == [
+            ("sendMessage", {"chat_id": 123, "text": "hello", "parse_mode": "Markdown"}),
+            ("answerCallbackQuery", {"callback_query_id": "cb1", "text": "done", "show_alert": False})
+        ], session.requests
+        assert session.decoded == 0, "response bodies were decoded"
+        logger.info("✅ Fast send path and callback answers skip decoding")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Bot fast send test failed: {e!r}")
+        return False
+
+async def test_bot_chat_member_and_edit():
+    """Test chat member lookups, their cache, and message edits through the real HTTPClient"""
+    try:
+        logger.info("Testing bale Bot chat member cache and edits...")
+        
+        bot = Bot(BOT_TOKEN, cache_dir=None)
+        session = _stub_session(bot, {
+            "getChatMember": lambda body: {"ok": True, "result": {"status": "administrator"}},
+            "editMessageText": lambda body: {"ok": True, "result": {"message_id": body["message_id"],
+                                                                    "text": body["text"]}}
+        })
+        
+        member = await bot.get_chat_member(10, 20)
+        assert member == {"status": "administrator"}, member
+        assert await bot.get_chat_member("10", "20") == member
+        bot.invalidate_chat_member(10, 20)
+        await bot.get_chat_member(10, 20)
+        
+        edited = await bot.edit_message_text(10, 5, "new")
+        assert (edited.message_id, edited.text) == (5, "new")
+        
+        assert session.requests == [
+            ("getChatMember", {"chat_id": 10, "user_id": 20}),
+            ("getChatMember", {"chat_id": 10, "user_id": 20}),
+            ("editMessageText", {"chat_id": 10, "message_id": 5, "text": "new"})
+        ], session.requests
+        logger.info("✅ Chat member lookups are cached until invalidated")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Bot chat member test failed: {e!r}")
+        return False
+
+class _RecordingHandler:
+    """Handler stand-in that accepts every update and records that it ran"""
+    def __init__(self, name, handled, commands=None):
+        self.name = name
+        self.handled = handled
+        if commands:
+            self.commands = commands
+    
+    def check_new_update(self, update):
+        return (update,)
+    
+    async def handle_update(self, update, *args):
+        self.handled.append(self.name)
+
+async def test_bot_handler_order():
+    """Test that Bot dispatch tries handlers in registration order, commands included"""
+    try:
+        logger.info("Testing bale Bot handler order...")
+        
+        update = {"update_id": 1, "message": {"message_id": 1, "text": "/start now"}}
+        
+        handled = []
+        bot = Bot(BOT_TOKEN, cache_dir=None)
+        bot.handle(_RecordingHandler("fallback", handled))
+        bot.handle(_RecordingHandler("start", handled, commands=["start"]))
+        await bot.process_update(update)
+        
+        bot = Bot(BOT_TOKEN, cache_dir=None)
+        bot.handle(_RecordingHandler("start", handled, commands=["start"]))
+        bot.handle(_RecordingHandler("fallback", handled))
+        await bot.process_update(update)
+        
+        assert handled == ["fallback", "start"], handled
+        logger.info("✅ The earliest registered matching handler wins")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Bot handler order test failed: {e!r}")
+        return False
+
 async def main():
     """Main test function"""
     logger.info("Starting Bale API integration tests...")
@@ -113,7 +355,25 @@ async def main():
     # Test 2: Full balletbot integration
     test2_passed = await test_balletbot_integration()
     
-    if test1_passed and test2_passed:
+    # Test 3: bale library polling against a stubbed session
+    test3_passed = await test_bot_long_polling()
+    
+    # Test 4: bale library sends that skip decoding the response
+    test4_passed = await test_bot_send_without_response()
+    
+    # Test 5: bale library handler order
+    test5_passed = await test_bot_handler_order()
+    
+    # Test 6: bale library shutdown with a bot info refresh in flight
+    test6_passed = await test_bot_stop_cancels_refresh()
+    
+    # Test 7: bale library chat member cache and message edits
+    test7_passed = await test_bot_chat_member_and_edit()
+    
+    # Test 8: mock polling stopped before its task runs
+    test8_passed = await test_mock_stop_before_poll()
+    
+    if all((test1_passed, test2_passed, test3_passed, test4_passed, test5_passed, test6_passed, test7_passed, test8_passed)):
         logger.info("🎉 All tests passed! Balletbot is ready with real Bale API.")
         return 0
     else:
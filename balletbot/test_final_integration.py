@@ -97,6 +97,204 @@ async def test_real_mode():
         logger.error(f"❌ Real mode test failed: {e}")
         return False
 
+async def test_real_polling_odd_updates():
+    """Test that real-mode polling survives updates without "from" or "message" """
+    try:
+        logger.info("Testing real-mode polling with incomplete updates...")
+        
+        from bale_api_real import BaleAPI
+        
+        bot = BaleAPI(BOT_TOKEN)
+        received = []
+        offsets = []
+        
+        @bot.command("/ping")
+        async def ping(message, args):
+            received.append(message.chat.id)
+        
+        async def get_updates(offset=0, timeout=0, allowed_updates=None):
+            offsets.append(offset)
+            if len(offsets) == 1:
+                return [
+                    # channel-style post: no "from"
+                    {"update_id": 1, "message": {"chat": {"id": 5, "type": "channel"}, "text": "/ping"}},
+                    # callback on an inline message: no "message"
+                    {"update_id": 2, "callback_query": {"id": "cb", "from": {"id": 7}, "data": "x"}},
+                    {"update_id": 3, "message": {"chat": {"id": 6, "type": "private"}, "from": {"id": 7}, "text": "/ping"}},
+                ]
+            bot.running = False
+            return []
+        
+        bot.get_updates = get_updates
+        await asyncio.wait_for(bot.start_polling(), 10)
+        await bot._wait_for_pending()
+        await bot._stop_sender()
+        await bot.close()
+        
+        assert offsets == [0, 4], offsets
+        assert received == [5, 6], received
+        logger.info("✅ Incomplete updates handled and skipped past")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Real-mode polling test failed: {e!r}")
+        return False
+
+async def test_real_group_chat_private_only():
+    """Test that a polled group-chat update reaches handlers as a group chat"""
+    try:
+        logger.info("Testing private-only commands on a polled group message...")
+        
+        from bale_api_real import BaleAPI, _slim_update
+        from core.game_loop import GameLoop, PRIVATE_ONLY_MSG
+        
+        bot = BaleAPI(BOT_TOKEN)
+        sent = []
+        
+        async def send_message(chat_id, text, reply_markup=None, parse_mode="Markdown"):
+            sent.append((chat_id, text))
+            return True
+        
+        bot.send_message = send_message
+        GameLoop(bot, None, None)._register_commands()
+        
+        for chat_id, chat_type in ((-100, "group"), (7, "private")):
+            await bot.process_update(_slim_update({"update_id": 1, "message": {
+                "message_id": 1,
+                "chat": {"id": chat_id, "type": chat_type},
+                "from": {"id": 7},
+                "text": "/map"
+            }}))
+        
+        assert sent[0] == ("-100", PRIVATE_ONLY_MSG), sent
+        assert sent[1][1] != PRIVATE_ONLY_MSG, sent
+        logger.info("✅ Group chat rejected, private chat allowed")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Group chat private-only test failed: {e!r}")
+        return False
+
+async def test_real_send_coalescing():
+    """Test that batched replies merge only when parse mode matches and no keyboard is attached"""
+    try:
+        logger.info("Testing batched reply coalescing...")
+        
+        from bale_api_real import BaleAPI
+        
+        bot = BaleAPI(BOT_TOKEN)
+        sent = []
+        
+        async def send_message_now(chat_id, text, reply_markup, parse_mode):
+            sent.append((chat_id, text, reply_markup, parse_mode))
+            return True
+        
+        bot._send_message_now = send_message_now
+        bot._start_sender()
+        keyboard = {"inline_keyboard": [[{"text": "Go", "callback_data": "go"}]]}
+        results = await asyncio.gather(
+            bot.send_message("1", "a"),
+            bot.send_message("1", "b"),
+            bot.send_message("1", "c", parse_mode="HTML"),
+            bot.send_message("1", "d", reply_markup=keyboard),
+            bot.send_message("1", "e"),
+            bot.send_message("2", "f"),
+        )
+        await bot._stop_sender()
+        
+        assert all(results), results
+        assert sent == [
+            ("1", "a\n\nb", None, "Markdown"),
+            ("1", "c", None, "HTML"),
+            ("1", "d", keyboard, "Markdown"),
+            ("1", "e", None, "Markdown"),
+            ("2", "f", None, "Markdown"),
+        ], sent
+        logger.info("✅ Only same-mode plain replies were merged")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Reply coalescing test failed: {e!r}")
+        return False
+
+async def test_real_pattern_handlers():
+    """Test that pattern handlers are tried in registration order and keep their own flags"""
+    try:
+        logger.info("Testing pattern-filtered message handlers...")
+        
+        import re
+        from bale_api_real import BaleAPI, _slim_update
+        
+        bot = BaleAPI(BOT_TOKEN)
+        handled = []
+        
+        @bot.message_handler(pattern="world")
+        async def on_world(message):
+            handled.append("world")
+        
+        @bot.message_handler(pattern="hello")
+        async def on_hello(message):
+            handled.append("hello")
+        
+        try:
+            bot.message_handler(pattern="(")
+            raise AssertionError("invalid pattern was accepted")
+        except re.error:
+            pass
+        
+        @bot.message_handler(pattern="(?i)^shout")
+        async def on_shout(message):
+            handled.append("shout")
+        
+        for text in ("hello world", "hello", "SHOUT it", "nothing"):
+            await bot.process_update(_slim_update({"update_id": 1, "message": {
+                "message_id": 1,
+                "chat": {"id": 7, "type": "private"},
+                "from": {"id": 7},
+                "text": text
+            }}))
+        
+        assert handled == ["world", "hello", "shout"], handled
+        logger.info("✅ First registered matching pattern wins")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Pattern handler test failed: {e!r}")
+        return False
+
+async def test_admin_check_shared():
+    """Test that concurrent admin checks for one user share a single getChatMember call"""
+    try:
+        logger.info("Testing concurrent admin checks...")
+        
+        from bale_api_real import BaleAPI
+        from core.game_loop import GameLoop
+        
+        bot = BaleAPI(BOT_TOKEN)
+        requests = []
+        
+        async def make_request(method, endpoint, data=None):
+            requests.append(endpoint)
+            await asyncio.sleep(0.01)
+            return {"ok": True, "result": {"status": "administrator"}}
+        
+        bot._make_request = make_request
+        game_loop = GameLoop(bot, None, None)
+        
+        results = await asyncio.gather(
+            game_loop._is_admin("-100", "7"),
+            game_loop._is_admin("-100", "7"),
+        )
+        assert results == [True, True], results
+        assert await game_loop._is_admin("-100", "7")
+        assert requests == ["getChatMember"], requests
+        logger.info("✅ Admin checks shared one getChatMember request")
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Admin check test failed: {e!r}")
+        return False
+
 async def test_full_balletbot():
     """Test the complete balletbot integration"""
     try:
@@ -163,15 +361,35 @@ async def main():
     # Test 3: Full balletbot
     test3_passed = await test_full_balletbot()
     
+    # Test 4: Real-mode polling with incomplete updates
+    test4_passed = await test_real_polling_odd_updates()
+    
+    # Test 5: Private-only commands on a polled group message
+    test5_passed = await test_real_group_chat_private_only()
+    
+    # Test 6: Batched replies merge only when that keeps their formatting
+    test6_passed = await test_real_send_coalescing()
+    
+    # Test 7: Pattern handlers in registration order
+    test7_passed = await test_real_pattern_handlers()
+    
+    # Test 8: Concurrent admin checks share one lookup
+    test8_passed = await test_admin_check_shared()
+    
     logger.info("\n" + "="*50)
     logger.info("TEST RESULTS SUMMARY")
     logger.info("="*50)
     logger.info(f"Mock Mode Test: {'✅ PASSED' if test1_passed else '❌ FAILED'}")
     logger.info(f"Real Mode Test: {'✅ PASSED' if test2_passed else '❌ FAILED'}")
     logger.info(f"Full BalletBot Test: {'✅ PASSED' if test3_passed else '❌ FAILED'}")
+    logger.info(f"Real Polling Test: {'✅ PASSED' if test4_passed else '❌ FAILED'}")
+    logger.info(f"Private-Only Group Test: {'✅ PASSED' if test5_passed else '❌ FAILED'}")
+    logger.info(f"Reply Coalescing Test: {'✅ PASSED' if test6_passed else '❌ FAILED'}")
+    logger.info(f"Pattern Handler Test: {'✅ PASSED' if test7_passed else '❌ FAILED'}")
+    logger.info(f"Admin Check Test: {'✅ PASSED' if test8_passed else '❌ FAILED'}")
     logger.info("="*50)
     
-    if test1_passed and test2_passed and test3_passed:
+    if test1_passed and test2_passed and test3_passed and test4_passed and test5_passed and test6_passed and test7_passed and test8_passed:
         logger.info("🎉 ALL TESTS PASSED! BalletBot is ready with Bale API integration.")
         logger.info("\n📋 NEXT STEPS:")
         logger.info("1. Set your real Bale bot token in config.py")
@@ -135,5 +135,26 @@ async def test_basic_functionality():
         import traceback
         traceback.print_exc()
 
+def test_helpers_import_keeps_tables_lazy():
+    """Importing utils.helpers on its own must not build config's lazy tables"""
+    import subprocess
+    
+    check = (
+        "import config, utils.helpers; "
+        "built = [name for name in config._LAZY_TABLES if name in vars(config)]; "
+        "assert not built, built"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", check],
+        cwd=str(Path(__file__).parent), capture_output=True, text=True
+    )
+    if result.returncode == 0:
+        print("✅ Importing helpers leaves the lazy config tables unbuilt")
+    else:
+        print(f"❌ Importing helpers built lazy config tables: {result.stderr.strip()}")
+    return result.returncode == 0
+
 if __name__ == "__main__":
-    asyncio.run(test_basic_functionality())
\ No newline at end of file
+    asyncio.run(test_basic_functionality())
+    if not test_helpers_import_keeps_tables_lazy():
+        sys.exit(1)
\ No newline at end of file
@@ -381,6 +381,13 @@ def log_event(event_type: str, payload: Dict[str, Any]) -> None:
         (int(time.time()), event_type, json.dumps(payload))
     )
 
+def log_events(events: List[Tuple[int, str, Dict[str, Any]]]) -> None:
+    """Log a batch of (time, type, payload) events to the database in one transaction"""
+    db.execute_many(
+        "INSERT INTO events (time, type, payload) VALUES (?, ?, ?)",
+        [(event_time, event_type, json.dumps(payload)) for event_time, event_type, payload in events]
+    )
+
 def log_message(level: str, message: str) -> None:
     """Log a message to the database"""
     import time
@@ -8,14 +8,16 @@ import re
 from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime, timedelta
 
+import config
+from config import GAME_CODE_CHARS, GAME_CODE_LENGTH
+
 def get_current_timestamp() -> int:
     """Get current Unix timestamp"""
     return int(time.time())
 
 def generate_game_code() -> str:
     """Generate a random game code"""
-    chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-    return ''.join(random.choice(chars) for _ in range(6))
+    return ''.join(random.choice(GAME_CODE_CHARS) for _ in range(GAME_CODE_LENGTH))
 
 def format_duration(seconds: int) -> str:
     """Format duration in human readable format"""
@@ -218,9 +220,7 @@ def format_recipe_info(recipe_data: Dict) -> str:
 
 def calculate_distance(location1: str, location2: str) -> int:
     """Calculate distance between two locations"""
-    # Simple distance calculation based on region
-    regions = ["Forest", "Urban", "Downtown", "Military", "Coast"]
-    
+    # Simple distance calculation based on region order
     try:
         region1, _, _ = parse_location(location1)
         region2, _, _ = parse_location(location2)
@@ -228,8 +228,10 @@ def calculate_distance(location1: str, location2: str) -> int:
         if region1 == region2:
             return 1
         
-        idx1 = regions.index(region1) if region1 in regions else 0
-        idx2 = regions.index(region2) if region2 in regions else 0
+        # looked up here, not imported, so importing helpers doesn't build the lazy tables
+        region_ids = config.REGION_IDS
+        idx1 = region_ids.get(region1, 0)
+        idx2 = region_ids.get(region2, 0)
         
         return abs(idx1 - idx2) + 1
     except:
@@ -246,10 +248,17 @@ def is_valid_username(username: str) -> bool:
     
     return True
 
+# Character classes keyed by their casefolded name, for case-insensitive input
+CHARACTER_CLASSES = {"scavenger": "Scavenger", "mechanic": "Mechanic", "soldier": "Soldier"}
+VALID_CLASSES = frozenset(CHARACTER_CLASSES.values())
+
 def is_valid_class(class_name: str) -> bool:
     """Validate character class"""
-    valid_classes = ["Scavenger", "Mechanic", "Soldier"]
-    return class_name in valid_classes
+    return class_name in VALID_CLASSES
+
+def canonical_class(class_name: str) -> Optional[str]:
+    """Properly capitalised class name for any casing of it, or None if not a class"""
+    return CHARACTER_CLASSES.get(class_name.casefold())
 
 def format_time_remaining(expire_time: int) -> str:
     """Format time remaining until expiration"""
@@ -0,0 +1,32 @@
+"""
+Media file helpers for BalletBot: Outbreak Dominion
+Reads upload files off the event loop and keeps small ones in memory
+"""
+
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from typing import Tuple
+
+# Only small files are kept in memory; maps and icons are re-sent often
+MEDIA_CACHE_SIZE = 32
+MEDIA_CACHE_MAX_BYTES = 1024 * 1024
+
+_media_cache: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+
+async def read_media(path: str) -> bytes:
+    """Read a media file in a worker thread, cached by path and modification time"""
+    stat = await asyncio.to_thread(Path(path).stat)
+    key = (path, stat.st_mtime_ns)
+
+    data = _media_cache.get(key)
+    if data is not None:
+        _media_cache.move_to_end(key)
+        return data
+
+    data = await asyncio.to_thread(Path(path).read_bytes)
+    if len(data) <= MEDIA_CACHE_MAX_BYTES:
+        _media_cache[key] = data
+        if len(_media_cache) > MEDIA_CACHE_SIZE:
+            _media_cache.popitem(last=False)
+    return data
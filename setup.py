@@ -7,6 +7,10 @@ setup(
     install_requires=[
         "aiohttp>=3.8.0",
     ],
+    extras_require={
+        "uvloop": ["uvloop>=0.17.0; platform_system != 'Windows'"],
+        "orjson": ["orjson>=3.8.0"],
+    },
     python_requires=">=3.8",
 )
 